@@ -1,21 +1,37 @@
+import os
+
 import pandas as pd
 import plotly.express as px
 import streamlit as st
 
+from utils.data import read_home
+from utils.datasets import cached, dataset_paths, dataset_version, select_dataset
+from utils.export import FORMATS, filtered_chunks, new_export_path, prune_exports, write_export
+from utils.live import LIVE_PATH, LiveFeed
+from utils.prefix import PrefixSums
+from utils.results import PREVIEW_ROWS, cached_home_view
+
 st.set_page_config(page_title="Online Sales Dashboard", layout="wide",page_icon='online-shop_164427.png')
 
 
 # ---------------- Load Data ----------------
-df = pd.read_csv("cleaned_dataset.csv")
+def load_data(dataset):
+    return cached(dataset, "home", lambda: read_home(dataset_paths(dataset)[0]))
+
+
+def load_prefix(dataset):
+    return cached(dataset, "prefix", lambda: PrefixSums(load_data(dataset)))
 
-df["invoicedate"] = pd.to_datetime(df["invoicedate"])
+
+dataset = select_dataset()
+df = load_data(dataset)
+prefix = load_prefix(dataset)
 
 # ---------------- Sidebar Filters ----------------
 st.sidebar.header("🔎 Filters")
 
 # Date Filter
-# Ensure datetime
-df["invoicedate"] = pd.to_datetime(df["invoicedate"])
+# (invoicedate is parsed on load; the cached frame is shared, so it is not modified here)
 
 # Dataset min and max dates
 min_date = df["invoicedate"].min().date()
@@ -39,6 +55,12 @@ end_date = st.sidebar.date_input(
 start_date = pd.Timestamp(start_date)
 end_date = pd.Timestamp(end_date)
 
+# Comparison period for the KPI deltas
+compare = st.sidebar.radio(
+    "Compare With",
+    ["Previous Period", "Previous Year", "None"]
+)
+
 # Country Filter
 country_list = ["All"] + sorted(df["country"].unique().tolist())
 
@@ -55,19 +77,18 @@ category_filter = st.sidebar.selectbox(
     category_list
 )
 
-# ---------------- Apply Filters ----------------
-filtered_df = df.copy()
-
-filtered_df = filtered_df[
-    (filtered_df["invoicedate"] >= start_date)&
-    (filtered_df["invoicedate"] <= end_date)
-]
+# Live Mode
+live = st.sidebar.toggle("🔴 Live Mode", help=f"Tail `{LIVE_PATH}` and refresh the live KPIs")
 
-if country_filter != "All":
-    filtered_df = filtered_df[filtered_df["country"] == country_filter]
+if live:
+    refresh = st.sidebar.select_slider("Refresh Every (s)", [2, 5, 10, 30], value=5)
 
-if category_filter != "All":
-    filtered_df = filtered_df[filtered_df["category"] == category_filter]
+# ---------------- Apply Filters ----------------
+# KPIs, preview and summary of this filter state, shared across sessions.
+view = cached_home_view(
+    dataset, dataset_version(dataset), df, prefix,
+    start_date, end_date, country_filter, category_filter
+)
 
 
 # ---------------- Title ----------------
@@ -93,31 +114,109 @@ It helps businesses understand purchasing patterns, improve pricing strategies,
 st.divider()
 
 # ---------------- KPIs ----------------
-total_sales = filtered_df["Gross_Sales"].sum()
-net_revenue = filtered_df["Net_Revenue"].sum()
-total_orders = filtered_df.shape[0]
-return_rate = filtered_df["IsReturned"].mean() * 100
-avg_order = filtered_df["Total_Order_Value"].mean()
+# Range sums come from the per-day prefix arrays: two lookups per period, no scans.
+kpis = view["kpis"]
+
+if compare == "Previous Period":
+    length = end_date - start_date + pd.Timedelta(days=1)
+    previous = prefix.kpis(start_date - length, start_date - pd.Timedelta(days=1), country_filter, category_filter)
+
+elif compare == "Previous Year":
+    previous = prefix.kpis(start_date - pd.DateOffset(years=1), end_date - pd.DateOffset(years=1), country_filter, category_filter)
+
+else:
+    previous = None
+
+
+def change(key):
+    """Percentage change against the comparison period, or None."""
+    if previous is None or pd.isna(previous[key]) or not previous[key] or pd.isna(kpis[key]):
+        return None
+    return f"{(kpis[key] - previous[key]) / abs(previous[key]):+.1%}"
+
+
+def points(key):
+    """Percentage-point change (for rates), or None."""
+    if previous is None or pd.isna(previous[key]) or pd.isna(kpis[key]):
+        return None
+    return f"{kpis[key] - previous[key]:+.2f} pp"
+
 
 col1, col2, col3, col4, col5 = st.columns(5)
 
-col1.metric("💰 Gross Sales", f"{total_sales:,.0f}")
-col2.metric("📈 Net Revenue", f"{net_revenue:,.0f}")
-col3.metric("🧾 Orders", f"{total_orders:,}")
-col4.metric("↩️ Return Rate", f"{return_rate:.2f}%")
-col5.metric("🛍️ Avg Order", f"{avg_order:,.0f}")
+col1.metric("💰 Gross Sales", f"{kpis['total_sales']:,.0f}", change("total_sales"))
+col2.metric("📈 Net Revenue", f"{kpis['net_revenue']:,.0f}", change("net_revenue"))
+col3.metric("🧾 Orders", f"{kpis['total_orders']:,}", change("total_orders"))
+col4.metric("↩️ Return Rate", f"{kpis['return_rate']:.2f}%", points("return_rate"), delta_color="inverse")
+col5.metric("🛍️ Avg Order", f"{kpis['avg_order']:,.0f}", change("avg_order"))
 
 st.divider()
 
+# ---------------- Live ----------------
+# One feed per process: each appended row is ingested once and shared by every session.
+@st.cache_resource
+def load_feed(path):
+    return LiveFeed(path)
+
+
+if live:
+    st.subheader("🔴 Live Transactions")
+
+    feed = load_feed(LIVE_PATH)
+
+    # Only this block reruns on the timer; each refresh ingests just the new rows.
+    @st.fragment(run_every=refresh)
+    def live_panel():
+        new_rows = feed.poll()
+
+        if not feed.rows:
+            st.info(f"Waiting for transactions in `{LIVE_PATH}` (try `python -m scripts.replay_live`).")
+            return
+
+        live_kpis = feed.kpis()
+
+        l1, l2, l3, l4, l5 = st.columns(5)
+
+        l1.metric("💰 Gross Sales", f"{live_kpis['total_sales']:,.0f}")
+        l2.metric("📈 Net Revenue", f"{live_kpis['net_revenue']:,.0f}")
+        l3.metric("🧾 Orders", f"{live_kpis['total_orders']:,}", f"+{new_rows:,}" if new_rows else None)
+        l4.metric("↩️ Return Rate", f"{live_kpis['return_rate']:.2f}%")
+        l5.metric("🛍️ Avg Order", f"{live_kpis['avg_order']:,.0f}")
+
+        c1, c2 = st.columns([2, 1])
+
+        c1.plotly_chart(
+            px.line(feed.trend_frame(), x="invoicedate", y="Net_Revenue", markers=True,
+                    title="Net Revenue per Minute"),
+            use_container_width=True
+        )
+        c2.plotly_chart(
+            px.bar(feed.category_frame(), x="category", y="Net_Revenue", title="Live Revenue by Category"),
+            use_container_width=True
+        )
+
+        st.caption(f"{feed.rows:,} rows in {feed.batches:,} micro-batches · refreshed every {refresh}s")
+
+    live_panel()
+
+    st.divider()
+
 # ---------------- Data Preview ----------------
 st.subheader("📄 Dataset Preview")
 
-rows = st.slider("Number of Rows", 5, 50, 10, 5)
 
-st.dataframe(
-    filtered_df.head(rows),
-    use_container_width=True
-)
+# The slider only reruns this fragment, not the filters and KPIs above.
+@st.fragment
+def data_preview():
+    rows = st.slider("Number of Rows", 5, PREVIEW_ROWS, 10, 5)
+
+    st.dataframe(
+        view["preview"].head(rows),
+        use_container_width=True
+    )
+
+
+data_preview()
 
 st.divider()
 
@@ -126,9 +225,52 @@ st.subheader("📌 Dataset Summary")
 
 c1, c2, c3 = st.columns(3)
 
-c1.metric("Rows", filtered_df.shape[0])
-c2.metric("Columns", filtered_df.shape[1])
-c3.metric("Missing Values", filtered_df.isnull().sum().sum())
+c1.metric("Rows", view["rows"])
+c2.metric("Columns", view["cols"])
+c3.metric("Missing Values", view["missing"])
+
+st.divider()
+
+# ---------------- Export ----------------
+st.subheader("⬇️ Export Filtered Data")
+
+
+# Rows are streamed from the CSV to a file chunk by chunk; nothing is materialised in memory.
+@st.fragment
+def export_data():
+    c1, c2 = st.columns([1, 3])
+
+    fmt = FORMATS[c1.radio("Format", list(FORMATS), horizontal=True)]
+    columns = c2.multiselect("Columns", df.columns.tolist(), default=df.columns.tolist())
+
+    if st.button(f"Prepare {view['rows']:,} Rows", disabled=not columns):
+        prune_exports()
+        out = new_export_path(fmt)
+
+        with st.status("Exporting…") as status:
+            chunks = filtered_chunks(
+                dataset_paths(dataset)[0], start_date, end_date, country_filter, category_filter, columns
+            )
+            rows = write_export(chunks, out, fmt, progress=lambda n: status.update(label=f"Exported {n:,} rows…"))
+            status.update(label=f"Exported {rows:,} rows", state="complete")
+
+        st.session_state["export_path"] = out
+
+    out = st.session_state.get("export_path")
+
+    if out and os.path.exists(out):
+        name = os.path.basename(out)
+
+        if st.get_option("server.enableStaticServing"):
+            # Served from disk by the static file handler, not through session memory.
+            st.markdown(f'<a href="app/{out.replace(os.sep, "/")}" download="{name}">📥 Download {name}</a>',
+                        unsafe_allow_html=True)
+        else:
+            with open(out, "rb") as f:
+                st.download_button(f"📥 Download {name}", f, file_name=name)
+
+
+export_data()
 
 st.divider()
 
@@ -1,6 +1,11 @@
-import pandas as pd
-import plotly.express as px
 import streamlit as st
+
+from utils.charts import category_counts, heavy_hitters_bar, univariate_categorical, univariate_numeric
+from utils.data import EXCLUDE_COLS, categorical_columns, high_cardinality_columns, numeric_columns, read_bivariate, read_dataset
+from utils.datasets import cached, dataset_paths, select_dataset
+from utils.figures import cached_figure
+from utils.heavy_hitters import CAPACITY, HeavyHitters
+
 # Page Config
 st.set_page_config(page_title="Online Sales Dashboard", layout="wide",page_icon='online-shop_164427.png')
 #df = pd.read_csv("cleaned_dataset.csv")
@@ -8,11 +13,20 @@ st.set_page_config(page_title="Online Sales Dashboard", layout="wide",page_icon=
 
 
 # ================== Load Data ==================
-@st.cache_data
-def load_data():
-    return pd.read_csv("cleaned_dataset.csv")
+def load_data(dataset):
+    return cached(dataset, "univariate", lambda: read_dataset(dataset_paths(dataset)[0]))
+
+# Space-Saving counters of the high-cardinality columns, built once per dataset version.
+# Shared with the Bivariate page and warm-up, so built from the same (Bivariate) frame.
+def load_hitters(dataset):
+    def build():
+        data = cached(dataset, "bivariate", lambda: read_bivariate(dataset_paths(dataset)[0]))
+        return HeavyHitters.from_frame(data, high_cardinality_columns(data))
 
-df = load_data()
+    return cached(dataset, "heavy_hitters", build)
+
+dataset = select_dataset()
+df = load_data(dataset)
 
 
 
@@ -29,18 +43,13 @@ st.divider()
 # ================= Sidebar =================
 st.sidebar.header("⚙️ Control Panel")
 
-num_cols = df.select_dtypes(include=["int64", "float64"]).columns.tolist()
-exclude_cols = ["CustomerID", "InvoiceDate", "InvoiceNo"]
-
-cat_cols = [
-    col for col in df.select_dtypes(include="object").columns
-    if col not in exclude_cols and df[col].nunique() < 50
-]
+num_cols = numeric_columns(df)
+cat_cols = categorical_columns(df, exclude=EXCLUDE_COLS)
 
 
 analysis_type = st.sidebar.radio(
     "Select Analysis Type",
-    ["Numerical", "Categorical"]
+    ["Numerical", "Categorical", "High-Cardinality"]
 )
 
 
@@ -70,26 +79,15 @@ if analysis_type == "Numerical":
     # ---------- Charts ----------
     col1, col2 = st.columns(2)
 
-    with col1:
+    fig1, fig2 = cached_figure(dataset, "univariate_numeric", (col,), lambda: univariate_numeric(df, col))
 
-        fig1 = px.histogram(
-            df,
-            x=col,
-            nbins=30,
-            title="Distribution"
-        )
+    with col1:
 
         st.plotly_chart(fig1, use_container_width=True)
 
 
     with col2:
 
-        fig2 = px.box(
-            df,
-            y=col,
-            title="Outliers"
-        )
-
         st.plotly_chart(fig2, use_container_width=True)
 
 
@@ -112,72 +110,97 @@ if analysis_type == "Numerical":
 
 
 
-# ================= Categorical =================
-else:
+# ================= High-Cardinality =================
+elif analysis_type == "High-Cardinality":
 
-    col = st.sidebar.selectbox("Select Column", cat_cols)
+    hitters = load_hitters(dataset)
 
-    st.subheader(f"📊 Analysis: {col}")
+    if not hitters.columns:
+        st.warning("No high-cardinality columns found.")
+        st.stop()
+
+    col = st.sidebar.selectbox("Select Column", hitters.columns)
+
+    by = st.sidebar.radio("Rank By", hitters.measures)
+
+    k = st.sidebar.slider("Top K", 5, 50, 10, 5)
+
+    st.subheader(f"🔝 Top {k}: {col}")
 
     st.divider()
 
 
-    counts = df[col].value_counts().reset_index()
-    counts.columns = [col, "Count"]
+    top = hitters.top(col, by, k)
+    ranked, other = top.iloc[:-1], top.iloc[-1]
 
 
     # ---------- KPIs ----------
     c1, c2, c3 = st.columns(3)
 
-    c1.metric("Categories", counts.shape[0])
-    c2.metric("Top Category", counts.iloc[0, 0])
-    c3.metric("Top %", f"{(counts.iloc[0,1]/counts['Count'].sum()*100):.1f}%")
+    c1.metric("Top Value", str(top.iloc[0][col]))
+    c2.metric(f"Top {k} Share", f"{1 - other['Share']:.1%}")
+    c3.metric("Max Overcount", f"{hitters.max_error(col, by):,.0f}")
 
 
     st.divider()
 
 
-    # ---------- Pie Columns ----------
-    pie_cols = [
-        "Customer_Type",
-        "orderpriority",
-        "shipmentprovider",
-        "category",
-        "paymentmethod",
-        "returnstatus",
-        "saleschannel"
-    ]
+    # ---------- Chart ----------
+    fig = cached_figure(dataset, "heavy_hitters", (col, by, k), lambda: heavy_hitters_bar(ranked, col, by))
 
+    st.plotly_chart(fig, use_container_width=True)
 
-    # ---------- Chart ----------
-    if col in pie_cols:
+    st.dataframe(
+        top.astype({col: str}).style.format({by: "{:,.0f}", "Error": "{:,.0f}", "Share": "{:.2%}"}, na_rep="—"),
+        use_container_width=True,
+        hide_index=True
+    )
 
-        fig = px.pie(
-            counts,
-            names=col,
-            values="Count",
-            hole=0.4,
-            title="Category Distribution"
-        )
+    st.caption(
+        f"Estimated from {CAPACITY:,} Space-Saving counters per column: each value is overcounted "
+        "by at most its Error (exact while the column has no more distinct values than counters)."
+    )
 
-        fig.update_traces(textinfo="percent+label")
 
-        st.plotly_chart(fig, use_container_width=True)
+    # ---------- Insight ----------
+    st.markdown("### 💡 Insight")
 
+    if other["Share"] < 0.5:
+        st.warning(f"The top {k} values account for most of the total {by}.")
 
     else:
+        st.info(f"Long tail: most of the total {by} lies outside the top {k} values.")
+
 
-        fig = px.bar(
-            counts,
-            x=col,
-            y="Count",
-            text="Count",
-            title="Category Frequency"
-        )
 
-        fig.update_traces(textposition="outside")
+# ================= Categorical =================
+else:
+
+    col = st.sidebar.selectbox("Select Column", cat_cols)
+
+    st.subheader(f"📊 Analysis: {col}")
+
+    st.divider()
+
+
+    counts = category_counts(df, col)
+
+
+    # ---------- KPIs ----------
+    c1, c2, c3 = st.columns(3)
+
+    c1.metric("Categories", counts.shape[0])
+    c2.metric("Top Category", counts.iloc[0, 0])
+    c3.metric("Top %", f"{(counts.iloc[0,1]/counts['Count'].sum()*100):.1f}%")
+
+
+    st.divider()
+
+
+    # ---------- Chart ----------
+    fig = cached_figure(dataset, "univariate_categorical", (col,), lambda: univariate_categorical(counts, col))
 
-        st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig, use_container_width=True)
 
 
     st.divider()
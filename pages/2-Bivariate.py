@@ -1,7 +1,19 @@
-import pandas as pd
-import plotly.express as px
 import streamlit as st
 
+from utils.charts import (
+    CATEGORY_AGGS, NUMERIC_CHART_TYPES, TIME_AGGS, TIME_GRAINS,
+    category_aggregate, category_bar, heavy_hitters_bar, correlation_heatmap, numeric_scatter, period_label,
+    time_aggregate, time_line
+)
+from utils.data import categorical_columns, date_columns, high_cardinality_columns, numeric_columns, read_bivariate
+from utils.parallel import aggregation_engine
+from utils.sampling import SAMPLE_SIZES, StratifiedSample
+from utils.stats import correlation_matrix, ranked_pairs
+from utils.datasets import cached, dataset_paths, select_dataset
+from utils.downsample import POINT_BUDGET
+from utils.figures import cached_figure
+from utils.heavy_hitters import COUNT, HeavyHitters
+
 
 
 
@@ -12,41 +24,52 @@ st.set_page_config(page_title="Online Sales Dashboard", layout="wide",page_icon=
 
 
 # ================= Load Data =================
-@st.cache_data
-def load_data():
-    df = pd.read_csv("cleaned_dataset.csv")
-
-    # Fix duplicate columns
-    df = df.loc[:, ~df.columns.duplicated()]
-
-    # Convert numeric-like columns
-    for col in df.columns:
-        try:
-            df[col] = pd.to_numeric(df[col])
-        except:
-            pass
-
-    return df
+def load_data(dataset):
+    return cached(dataset, "bivariate", lambda: read_bivariate(dataset_paths(dataset)[0]))
 
 
-df = load_data()
+dataset = select_dataset()
+df = load_data(dataset)
 
 
 # ==================================================
 # COLUMN TYPES
 # ==================================================
 
-num_cols = df.select_dtypes(include=["int64", "float64"]).columns.tolist()
+num_cols = numeric_columns(df)
+cat_cols = categorical_columns(df)
+date_cols = date_columns(df)
+
+
+# Encoded once per dataset version and shared by every category/numeric pair
+# (partitioned across CPU cores for large data).
+def load_engine(dataset):
+    data = load_data(dataset)
+    return cached(dataset, "engine", lambda: aggregation_engine(data, categorical_columns(data), numeric_columns(data)))
+
+
+engine = load_engine(dataset)
+
+
+# All pairwise correlations over the full data, computed once per dataset version.
+def load_correlations(dataset):
+    return cached(dataset, "correlations", lambda: correlation_matrix(df, num_cols))
+
+
+corr_matrix = load_correlations(dataset)
+
+
+# Fixed-size stratified samples: the same rows on every rerun and in every session.
+def load_samples(dataset):
+    return cached(dataset, "samples", lambda: StratifiedSample(df))
+
 
-cat_cols = [
-    c for c in df.select_dtypes(include="object").columns
-    if df[c].nunique() < 50
-]
+samples = load_samples(dataset)
 
-date_cols = [
-    c for c in df.columns
-    if "date" in c.lower() or "time" in c.lower()
-]
+
+# Space-Saving counters of the high-cardinality columns (products, customers), built once per dataset version.
+def load_hitters(dataset):
+    return cached(dataset, "heavy_hitters", lambda: HeavyHitters.from_frame(df, high_cardinality_columns(df)))
 
 
 # ==================================================
@@ -66,10 +89,11 @@ st.divider()
 # TABS
 # ==================================================
 
-tab1, tab2, tab3 = st.tabs([
+tab1, tab2, tab3, tab4 = st.tabs([
     "🔢 Numeric vs Numeric",
     "🏷️ Category vs Numeric",
-    "📅 Time vs Numeric"
+    "📅 Time vs Numeric",
+    "🔝 Top Items"
 ])
 
 
@@ -77,14 +101,9 @@ tab1, tab2, tab3 = st.tabs([
 # TAB 1 : NUMERIC vs NUMERIC
 # ==================================================
 
-with tab1:
-
-    st.subheader("🔢 Numeric vs Numeric Analysis")
-
-    if len(num_cols) < 2:
-        st.warning("Not enough numeric columns.")
-        st.stop()
-
+# The controls below the heatmap rerun only this fragment.
+@st.fragment
+def numeric_vs_numeric():
 
     c1, c2, c3, c4 = st.columns(4)
 
@@ -102,32 +121,29 @@ with tab1:
 
     chart_type = c3.selectbox(
         "Chart Type",
-        [
-            "Correlation Scatter",
-            #"Regression Line",
-            "Distribution View",
-            #"Density Heatmap"
-        ],
+        NUMERIC_CHART_TYPES,
         key="num_chart"
     )
 
-    sample = c4.slider(
+    sizes = [s for s in SAMPLE_SIZES if s < len(df)]
+
+    sample = c4.select_slider(
         "Sample Size",
-        500,
-        min(5000, len(df)),
-        min(2000, len(df)),
+        sizes,
+        value=2000 if 2000 in sizes else sizes[-1],
         key="num_sample"
-    )
+    ) if len(sizes) > 1 else (sizes or [None])[0]
 
 
-    temp = df[[x_col, y_col]].dropna()
+    if sample is None:
+        temp = df[[x_col, y_col]].dropna()
 
-    if len(temp) > sample:
-        temp = temp.sample(sample)
+    else:
+        temp = df[[x_col, y_col]].iloc[samples.sample(sample)].dropna()
 
 
-    # KPIs
-    corr = temp[x_col].corr(temp[y_col])
+    # KPIs (correlation is the exact full-data value, not the sample's)
+    corr = corr_matrix.loc[x_col, y_col]
 
     m1, m2, m3 = st.columns(3)
 
@@ -137,63 +153,55 @@ with tab1:
 
 
     # Charts
-    if chart_type == "Correlation Scatter":
-
-        fig = px.scatter(
-            temp,
-            x=x_col,
-            y=y_col,
-            trendline="ols",
-            opacity=0.7
-        )
+    fig = cached_figure(
+        dataset, "numeric_scatter", (x_col, y_col, chart_type, sample),
+        lambda: numeric_scatter(temp, x_col, y_col, chart_type)
+    )
 
+    st.plotly_chart(fig, use_container_width=True)
 
-    elif chart_type == "Regression Line":
 
-        fig = px.scatter(
-            temp,
-            x=x_col,
-            y=y_col,
-            trendline="ols"
-        )
+    # Insight
+    st.markdown("### 💡 Insight")
 
+    if abs(corr) > 0.7:
+        st.success("Strong relationship detected.")
 
-    elif chart_type == "Distribution View":
+    elif abs(corr) > 0.4:
+        st.info("Moderate relationship exists.")
 
-        fig = px.scatter(
-            temp,
-            x=x_col,
-            y=y_col,
-            marginal_x="histogram",
-            marginal_y="box"
-        )
+    else:
+        st.warning("Weak or no clear relationship.")
 
 
-    else:  # Density
 
-        fig = px.density_heatmap(
-            temp,
-            x=x_col,
-            y=y_col
-        )
+with tab1:
 
+    st.subheader("🔢 Numeric vs Numeric Analysis")
 
-    fig.update_layout(height=550)
+    if len(num_cols) < 2:
+        st.warning("Not enough numeric columns.")
+        st.stop()
 
-    st.plotly_chart(fig, use_container_width=True)
 
+    c1, c2 = st.columns([3, 2])
 
-    # Insight
-    st.markdown("### 💡 Insight")
+    c1.plotly_chart(
+        cached_figure(dataset, "correlation_heatmap", (), lambda: correlation_heatmap(corr_matrix)),
+        use_container_width=True
+    )
 
-    if abs(corr) > 0.7:
-        st.success("Strong relationship detected.")
+    with c2:
+        st.markdown("#### 🔗 Strongest Pairs")
+        st.dataframe(
+            ranked_pairs(corr_matrix).style.format({"Correlation": "{:.3f}"}),
+            use_container_width=True,
+            height=500
+        )
 
-    elif abs(corr) > 0.4:
-        st.info("Moderate relationship exists.")
+    st.divider()
 
-    else:
-        st.warning("Weak or no clear relationship.")
+    numeric_vs_numeric()
 
 
 
@@ -201,13 +209,14 @@ with tab1:
 # TAB 2 : CATEGORY vs NUMERIC
 # ==================================================
 
-with tab2:
+@st.fragment
+def category_vs_numeric():
 
     st.subheader("🏷️ Category vs Numeric Analysis")
 
     if not cat_cols or not num_cols:
         st.warning("Not enough columns for this analysis.")
-        st.stop()
+        return
 
 
     c1, c2, c3 = st.columns(3)
@@ -226,24 +235,13 @@ with tab2:
 
     agg = c3.radio(
         "Aggregation",
-        ["Mean", "Sum", "Median"],
+        CATEGORY_AGGS,
         horizontal=True,
         key="cat_agg"
     )
 
 
-    if agg == "Sum":
-        temp = df.groupby(cat)[metric].sum()
-
-    elif agg == "Median":
-        temp = df.groupby(cat)[metric].median()
-
-    else:
-        temp = df.groupby(cat)[metric].mean()
-
-
-    temp = temp.round(2).reset_index()
-    temp = temp.sort_values(metric, ascending=False)
+    temp = category_aggregate(df, cat, metric, agg, engine)
 
 
     # KPIs
@@ -255,19 +253,13 @@ with tab2:
 
 
     # Chart
-    fig = px.bar(
-        temp,
-        x=cat,
-        y=metric,
-        text=metric,
-        title=f"{agg} {metric} by {cat}"
-    )
-
-    fig.update_traces(textposition="outside")
-    fig.update_layout(height=550)
+    fig = cached_figure(dataset, "category_bar", (cat, metric, agg), lambda: category_bar(temp, cat, metric, agg))
 
     st.plotly_chart(fig, use_container_width=True)
 
+    if agg == "Median" and getattr(engine, "approximate_quantiles", False):
+        st.caption("Medians are merged from per-partition sketches and interpolated between the middle values (within ±1%).")
+
 
     # Insight
     st.markdown("### 💡 Insight")
@@ -279,21 +271,27 @@ with tab2:
 
 
 
+with tab2:
+    category_vs_numeric()
+
+
+
 # ==================================================
 # TAB 3 : TIME vs NUMERIC
 # ==================================================
 
-with tab3:
+@st.fragment
+def time_vs_numeric():
 
     st.subheader("📅 Time Trend Analysis")
 
 
     if not date_cols:
         st.warning("No date column found.")
-        st.stop()
+        return
 
 
-    c1, c2, c3 = st.columns(3)
+    c1, c2, c3, c4 = st.columns(4)
 
     date_col = c1.selectbox(
         "Date Column",
@@ -309,54 +307,117 @@ with tab3:
 
     agg = c3.radio(
         "Aggregation",
-        ["Mean", "Sum"],
+        TIME_AGGS,
         horizontal=True,
         key="time_agg"
     )
 
+    grain = c4.radio(
+        "Granularity",
+        list(TIME_GRAINS),
+        horizontal=True,
+        key="time_grain"
+    )
 
-    temp = df.copy()
 
-    temp[date_col] = pd.to_datetime(
-        temp[date_col],
-        errors="coerce"
-    )
+    temp = time_aggregate(df, date_col, metric, agg, grain)
 
-    temp = temp.dropna(subset=[date_col])
 
+    fig = cached_figure(dataset, "time_line", (date_col, metric, agg, grain), lambda: time_line(temp, metric, agg))
 
-    temp["YearMonth"] = temp[date_col].dt.to_period("M").astype(str)
+    st.plotly_chart(fig, use_container_width=True)
 
+    if len(temp) > POINT_BUDGET:
+        st.caption(f"📉 {len(temp):,} periods drawn as {POINT_BUDGET:,} shape-preserving points (LTTB).")
 
-    if agg == "Sum":
-        temp = temp.groupby("YearMonth", as_index=False)[metric].sum()
 
-    else:
-        temp = temp.groupby("YearMonth", as_index=False)[metric].mean()
+    # Insight
+    st.markdown("### 💡 Insight")
+
+    peak = period_label(temp.loc[temp[metric].idxmax()].iloc[0], grain)
 
+    st.info(f"Peak performance in **{peak}**")
 
-    temp[metric] = temp[metric].round(2)
 
 
-    fig = px.line(
-        temp,
-        x="YearMonth",
-        y=metric,
-        markers=True,
-        title=f"{agg} {metric} Over Time"
+with tab3:
+    time_vs_numeric()
+
+
+
+# ==================================================
+# TAB 4 : TOP ITEMS OF HIGH-CARDINALITY COLUMNS
+# ==================================================
+
+@st.fragment
+def top_items():
+
+    st.subheader("🔝 Top Items")
+
+    hitters = load_hitters(dataset)
+
+    if not hitters.columns or len(hitters.measures) < 2:
+        st.warning("No high-cardinality columns with Net_Revenue found.")
+        return
+
+
+    c1, c2, c3 = st.columns(3)
+
+    col = c1.selectbox(
+        "Column",
+        hitters.columns,
+        key="top_col"
+    )
+
+    by = c2.radio(
+        "Rank By",
+        hitters.measures,
+        horizontal=True,
+        key="top_by"
     )
 
-    fig.update_layout(height=550)
+    k = c3.slider("Top K", 5, 50, 10, 5, key="top_k")
+
+
+    # The other measure of the same items, from its own counters.
+    top = hitters.top_items(col, by, k)
+    other_by = next(m for m in hitters.measures if m != by)
+
+    ranked = top.iloc[:-1]
+
+
+    # KPIs
+    m1, m2, m3 = st.columns(3)
+
+    m1.metric("Top Item", str(ranked.iloc[0][col]))
+    m2.metric(f"Top {k} Share", f"{1 - top.iloc[-1]['Share']:.1%}")
+
+    per_row = (ranked["Net_Revenue"] / ranked[COUNT]).mean()
+    m3.metric("Avg Net_Revenue per Row", f"{per_row:,.2f}")
+
+
+    # Chart
+    fig = cached_figure(
+        dataset, "top_items", (col, by, k),
+        lambda: heavy_hitters_bar(ranked, col, by, color=other_by)
+    )
 
     st.plotly_chart(fig, use_container_width=True)
 
+    st.dataframe(
+        top.astype({col: str}).style.format({by: "{:,.0f}", other_by: "{:,.0f}", "Error": "{:,.0f}", "Share": "{:.2%}"}, na_rep="—"),
+        use_container_width=True,
+        hide_index=True
+    )
 
-    # Insight
-    st.markdown("### 💡 Insight")
+    st.caption(
+        f"Space-Saving estimates: each {by} is overcounted by at most its Error "
+        f"(at most {hitters.max_error(col, by):,.0f}). {other_by} is shown where its own counters track the item."
+    )
 
-    max_month = temp.loc[temp[metric].idxmax(), "YearMonth"]
 
-    st.info(f"Peak performance in **{max_month}**")
+with tab4:
+    top_items()
 
 
 
@@ -1,7 +1,17 @@
-import pandas as pd
-import plotly.express as px
 import streamlit as st
 
+from utils.charts import (
+    INSIGHT_DIMENSIONS, TIME_GRAINS, discount_by_return, discount_vs_profit, filtered_insight_aggregates,
+    insight_aggregates, insight_crossfilter, insight_scatter_rows, insight_statistics, selected_values,
+    monthly_revenue, return_rate_by_country, return_rate_by_category, revenue_by_category,
+    revenue_by_channel, revenue_by_customer_type, revenue_by_payment, revenue_timeline, shipping_vs_revenue,
+    time_aggregate
+)
+from utils.bootstrap import insight_uncertainty
+from utils.data import read_insights
+from utils.datasets import cached, dataset_paths, select_dataset
+from utils.figures import cached_figure
+
 # ================= PAGE CONFIG =================
 st.set_page_config(page_title="Online Sales Dashboard", layout="wide",page_icon='online-shop_164427.png')
 
@@ -23,33 +33,39 @@ st.markdown("""
 #
 
 # ================= LOAD DATA =================
-@st.cache_data
-def load_data():
+def load_data(dataset):
+    return cached(dataset, "insights", lambda: read_insights(dataset_paths(dataset)[0]))
+
+
+def load_aggregates(dataset):
+    aggregates = cached(dataset, "insight_aggregates", lambda: insight_aggregates(load_data(dataset)))
+    stats = cached(dataset, "insight_statistics", lambda: insight_statistics(load_data(dataset), aggregates))
+    return aggregates, stats
+
 
-    df = pd.read_csv("cleaned_dataset.csv")
+def load_crossfilter(dataset):
+    return cached(dataset, "crossfilter", lambda: insight_crossfilter(load_data(dataset)))
 
-    num_cols = [
-        "quantity", "unitprice", "shippingcost",
-        "Gross_Sales", "Net_Revenue",
-        "Total_Order_Value", "Shipping_Ratio",
-        "discount"
-    ]
 
-    for col in num_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
+def load_timeline(dataset, grain):
+    return cached(dataset, f"timeline_{grain}", lambda: time_aggregate(load_data(dataset), "invoicedate", "Net_Revenue", "Sum", grain))
 
-    if "invoicedate" in df.columns:
-        df["invoicedate"] = pd.to_datetime(df["invoicedate"], errors="coerce")
 
-    return df
+# The scatter views draw a fixed stratified sample, filtered by the cross-filters.
+def load_scatter_sample(dataset):
+    rows = cached(dataset, "insight_scatter_rows", lambda: insight_scatter_rows(load_data(dataset)))
+    return rows, cached(dataset, "insight_scatter_sample", lambda: load_data(dataset).iloc[rows])
 
 
-df = load_data()
+def load_uncertainty(dataset):
+    return cached(dataset, "insight_uncertainty", lambda: insight_uncertainty(load_data(dataset)))
 
 
-# ================= PROFIT COLUMN =================
-df["Profit"] = df["Net_Revenue"] - df["shippingcost"]
+dataset = select_dataset()
+df = load_data(dataset)
+aggregates, stats = load_aggregates(dataset)
+xf = load_crossfilter(dataset)
+scatter_rows, scatter_df = load_scatter_sample(dataset)
 
 
 # ================= TITLE =================
@@ -67,11 +83,11 @@ st.divider()
 
 st.subheader("🎯 Executive Summary")
 
-total_sales = df["Gross_Sales"].sum()
-net_revenue = df["Net_Revenue"].sum()
-return_rate = df["IsReturned"].mean()
-top_category = df.groupby("category")["Net_Revenue"].sum().idxmax()
-top_channel = df.groupby("saleschannel")["Net_Revenue"].sum().idxmax()
+total_sales = stats["total_sales"]
+net_revenue = stats["net_revenue"]
+return_rate = stats["return_rate"]
+top_category = stats["top_category"]
+top_channel = stats["top_channel"]
 
 st.markdown(f"""
 This business generated *{total_sales:,.0f}   in total revenue with a total profit of  *{net_revenue:,.0f}**.
@@ -95,30 +111,99 @@ st.divider()
 st.subheader("📌 Key Business Questions & Insights")
 
 
+# ================= CROSS-FILTER =================
+# Each clickable chart's selection filters every other chart on the page.
+if "xf_generation" not in st.session_state:
+    st.session_state["xf_generation"] = 0
+
+
+def chart_key(chart_id):
+    return f"xf_{chart_id}_{st.session_state['xf_generation']}"
+
+
+filters = {}
+
+for chart_id, (dim, _, _) in INSIGHT_DIMENSIONS.items():
+    state = st.session_state.get(chart_key(chart_id))
+    if state and state.selection.points:
+        filters.setdefault(dim, set()).update(selected_values(chart_id, state.selection.points))
+
+if filters:
+    aggregates = filtered_insight_aggregates(xf, filters)
+    scatter_df = scatter_df[xf.row_mask(filters, scatter_rows)]
+
+    c1, c2 = st.columns([5, 1])
+
+    c1.info("🔗 Filtered by " + "; ".join(
+        f"**{dim}** = {', '.join(str(v) for v in sorted(values, key=str))}" for dim, values in filters.items()
+    ))
+
+    if c2.button("✖ Clear Filters"):
+        st.session_state["xf_generation"] += 1
+        st.rerun()
+
+else:
+    st.caption("💡 Click bars, slices or points in a chart to filter all the other charts.")
+
+
+# Figures are cached per dataset version and cross-filter state.
+filter_key = tuple(sorted((dim, tuple(sorted(values, key=str))) for dim, values in filters.items()))
+
+
+def figure(chart_id, build):
+    return cached_figure(dataset, chart_id, filter_key, build)
+
+
+# ================= UNCERTAINTY =================
+show_ci = st.toggle("📐 Show statistical confidence (bootstrap CIs and permutation tests)")
+
+if show_ci:
+    with st.spinner("Resampling..."):
+        uncertainty = load_uncertainty(dataset)
+
+    st.caption(
+        f"95% intervals from {uncertainty['n_resamples']:,} bootstrap resamples of the full dataset "
+        "(cross-filters do not apply)."
+    )
+
+
 # =====================================================
 # Q1 Do Discounts Increase Returns?
 # =====================================================
 with st.expander("1️⃣ Do higher discounts lead to more returned orders?"):
 
-    data = df.groupby("IsReturned")["discount"].mean().round(4).reset_index()
+    data = aggregates["q1_discount_by_return"]
 
-    fig = px.bar(
-        data,
-        x="IsReturned",
-        y="discount",
-        text_auto=True,
-        title="Average Discount by Return Status",
-        labels={"IsReturned": "0 = NotReturned   and  1 = Returned"},
+    fig = figure("q1_discount_by_return", lambda: discount_by_return(data))
 
+    st.plotly_chart(
+        fig,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="points",
+        key=chart_key("q1_discount_by_return")
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    if len(data) > 1:
+        diff = data.iloc[1]["discount"] - data.iloc[0]["discount"]
+
+        st.metric("Discount Difference", f"{diff:.4f}")
 
-    diff = data.iloc[1]["discount"] - data.iloc[0]["discount"]
+    if show_ci:
+        q1 = uncertainty["discount_returns"]
+        low, high = q1["ci"]
 
-    st.metric("Discount Difference", f"{diff:.4f}")
+        c1, c2 = st.columns(2)
+        c1.metric("95% CI of Difference", f"[{low:.4f}, {high:.4f}]")
+        c2.metric("Permutation p-value", f"{q1['p_value']:.3f}")
 
-    st.info("📌 Insight: Discounts do NOT significantly impact return rates.")
+        if low <= 0 <= high:
+            st.info("📌 Insight: Discounts do NOT significantly impact return rates (the interval includes zero).")
+        else:
+            st.warning("📌 Insight: Returned orders carry a significantly different discount (the interval excludes zero).")
+
+    else:
+        st.info("📌 Insight: Discounts do NOT significantly impact return rates.")
 
 
 # =====================================================
@@ -126,41 +211,42 @@ with st.expander("1️⃣ Do higher discounts lead to more returned orders?"):
 # =====================================================
 with st.expander("2️⃣ Which category generates the highest revenue?"):
 
-    data = df.groupby("category")["Net_Revenue"].sum().sort_values(ascending=False).reset_index()
+    data = aggregates["q2_revenue_by_category"]
 
-    fig = px.bar(
-        data,
-        x="category",
-        y="Net_Revenue",
-        text_auto=True,
-        color="category",
-        title="Total Net Revenue by Category"
-    )
+    fig = figure("q2_revenue_by_category", lambda: revenue_by_category(data))
 
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(
+        fig,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="points",
+        key=chart_key("q2_revenue_by_category")
+    )
 
     top = data.iloc[0]["category"]
 
     st.success(f"🏆 Top Revenue Category: {top}")
 
+    if show_ci:
+        st.dataframe(uncertainty["category_revenue"], use_container_width=True, hide_index=True)
+
 
 # =====================================================
 # Q3 Country with Highest Return Rate
 # =====================================================
 with st.expander("3️⃣ Which country has the highest return rate?"):
 
-    data = df.groupby("country")["IsReturned"].mean().sort_values(ascending=False).reset_index()
+    data = aggregates["q3_return_rate_by_country"]
 
-    fig = px.bar(
-        data.head(10),
-        x="country",
-        y="IsReturned",
-        text_auto=".2%",
-        title="Top 10 Countries by Return Rate",
-        color='country'
-    )
+    fig = figure("q3_return_rate_by_country", lambda: return_rate_by_country(data))
 
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(
+        fig,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="points",
+        key=chart_key("q3_return_rate_by_country")
+    )
 
     worst = data.iloc[0]["country"]
 
@@ -172,44 +258,47 @@ with st.expander("3️⃣ Which country has the highest return rate?"):
 # =====================================================
 with st.expander("4️⃣ Does sales channel affect revenue?"):
 
-    data = df.groupby("saleschannel")["Net_Revenue"].sum().reset_index()
+    data = aggregates["q4_revenue_by_channel"]
 
-    fig = px.bar(
-        data,
-        x="saleschannel",
-        y="Net_Revenue",
-        text_auto=True,
-        color="saleschannel",
-        title="Revenue by Sales Channel"
-    )
+    fig = figure("q4_revenue_by_channel", lambda: revenue_by_channel(data))
 
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(
+        fig,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="points",
+        key=chart_key("q4_revenue_by_channel")
+    )
 
     best = data.sort_values("Net_Revenue", ascending=False).iloc[0]["saleschannel"]
 
     st.success(f"🏆 Best Performing Channel: {best}")
 
+    if show_ci:
+        st.dataframe(uncertainty["channel_revenue"], use_container_width=True, hide_index=True)
+
 
 # =====================================================
 # Q5 Shipping Cost vs Revenue
 # =====================================================
 with st.expander("5️⃣ Is there a relationship between shipping cost and revenue?"):
 
-    fig = px.scatter(
-        df,
-        x="shippingcost",
-        y="Net_Revenue",
-        trendline="ols",
-        opacity=0.5,
-        title="Shipping Cost vs Net Revenue"
-    )
+    fig = figure("q5_shipping_vs_revenue", lambda: shipping_vs_revenue(scatter_df))
 
     st.plotly_chart(fig, use_container_width=True)
 
-    corr = df["shippingcost"].corr(df["Net_Revenue"])
+    if filters:
+        corr = scatter_df["shippingcost"].corr(scatter_df["Net_Revenue"])
+    else:
+        corr = stats["shipping_revenue_corr"]
 
     st.metric("Correlation", f"{corr:.4f}")
 
+    st.caption(
+        f"{len(scatter_df):,} points from a stratified sample of the data"
+        + ("; the correlation is the filtered sample's." if filters else "; the correlation uses every row.")
+    )
+
     st.info("📌 Insight: Shipping cost has no meaningful impact on revenue.")
 
 
@@ -218,16 +307,17 @@ with st.expander("5️⃣ Is there a relationship between shipping cost and reve
 # =====================================================
 with st.expander("6️⃣ Which customer type spends more?"):
 
-    data = df.groupby("Customer_Type")["Net_Revenue"].sum().reset_index()
+    data = aggregates["q6_revenue_by_customer_type"]
 
-    fig = px.pie(
-        data,
-        names="Customer_Type",
-        values="Net_Revenue",
-        title="Revenue Contribution by Customer Type"
-    )
+    fig = figure("q6_revenue_by_customer_type", lambda: revenue_by_customer_type(data))
 
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(
+        fig,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="points",
+        key=chart_key("q6_revenue_by_customer_type")
+    )
 
     st.info("📌 Insight: Registered customers generate the majority of revenue.")
 
@@ -235,24 +325,43 @@ with st.expander("6️⃣ Which customer type spends more?"):
 # =====================================================
 # Q7 Seasonality Analysis
 # =====================================================
+# The granularity radio reruns only the timeline.
+@st.fragment
+def revenue_timeline_section():
+
+    grain = st.radio(
+        "Timeline granularity",
+        list(TIME_GRAINS),
+        horizontal=True,
+        key="q7_grain"
+    )
+
+    # Filtered timelines scan the matching rows only on a figure cache miss.
+    def build():
+        if filters:
+            data = time_aggregate(df[xf.row_mask(filters)], "invoicedate", "Net_Revenue", "Sum", grain)
+        else:
+            data = load_timeline(dataset, grain)
+        return revenue_timeline(data, grain)
+
+    st.plotly_chart(figure(f"timeline_{grain}", build), use_container_width=True)
+
+
 with st.expander("7️⃣ Is there seasonality in sales?"):
 
-    temp = df.dropna(subset=["invoicedate"]).copy()
-    temp["Month"] = temp["invoicedate"].dt.month
-    temp["Month_Name"] = temp["invoicedate"].dt.strftime("%b")
+    data = aggregates["q7_monthly_revenue"]
 
-    data = temp.groupby(["Month","Month_Name"])["Net_Revenue"].sum().reset_index()
-    data = data.sort_values("Month")
+    fig = figure("q7_monthly_revenue", lambda: monthly_revenue(data))
 
-    fig = px.line(
-        data,
-        x="Month_Name",
-        y="Net_Revenue",
-        markers=True,
-        title="Monthly Revenue Trend"
+    st.plotly_chart(
+        fig,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="points",
+        key=chart_key("q7_monthly_revenue")
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    revenue_timeline_section()
 
     st.info("📌 Insight: Revenue fluctuates across months, indicating seasonality.")
 
@@ -262,18 +371,17 @@ with st.expander("7️⃣ Is there seasonality in sales?"):
 # =====================================================
 with st.expander("8️⃣ Which payment method generates the highest revenue?"):
 
-    data = df.groupby("paymentmethod")["Net_Revenue"].sum().sort_values(ascending=False).reset_index()
+    data = aggregates["q8_revenue_by_payment"]
 
-    fig = px.bar(
-        data,
-        x="paymentmethod",
-        y="Net_Revenue",
-        text_auto=True,
-        title="Revenue by Payment Method",
-        color= "paymentmethod"
-    )
+    fig = figure("q8_revenue_by_payment", lambda: revenue_by_payment(data))
 
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(
+        fig,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="points",
+        key=chart_key("q8_revenue_by_payment")
+    )
 
     top = data.iloc[0]["paymentmethod"]
 
@@ -285,18 +393,17 @@ with st.expander("8️⃣ Which payment method generates the highest revenue?"):
 # =====================================================
 with st.expander("9️⃣ Which category has the highest return rate?"):
 
-    data = df.groupby("category")["IsReturned"].mean().sort_values(ascending=False).reset_index()
+    data = aggregates["q9_return_rate_by_category"]
 
-    fig = px.bar(
-        data,
-        x="category",
-        y="IsReturned",
-        text_auto=".2%",
-        title="Return Rate by Category",
-        color = 'category'
-    )
+    fig = figure("q9_return_rate_by_category", lambda: return_rate_by_category(data))
 
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(
+        fig,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="points",
+        key=chart_key("q9_return_rate_by_category")
+    )
 
     worst = data.iloc[0]["category"]
 
@@ -308,21 +415,22 @@ with st.expander("9️⃣ Which category has the highest return rate?"):
 # =====================================================
 with st.expander("🔟 How do discounts impact profit?"):
 
-    fig = px.scatter(
-        df,
-        x="discount",
-        y="Profit",
-        trendline="ols",
-        opacity=0.5,
-        title="Discount vs Profit"
-    )
+    fig = figure("q10_discount_vs_profit", lambda: discount_vs_profit(scatter_df))
 
     st.plotly_chart(fig, use_container_width=True)
 
-    corr = df["discount"].corr(df["Profit"])
+    if filters:
+        corr = scatter_df["discount"].corr(scatter_df["Profit"])
+    else:
+        corr = stats["discount_profit_corr"]
 
     st.metric("Correlation", f"{corr:.4f}")
 
+    st.caption(
+        f"{len(scatter_df):,} points from a stratified sample of the data"
+        + ("; the correlation is the filtered sample's." if filters else "; the correlation uses every row.")
+    )
+
     st.info("📌 Insight: Excessive discounting may reduce profitability.")
 
 
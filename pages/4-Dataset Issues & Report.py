@@ -1,9 +1,16 @@
+import os
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-from ydata_profiling import ProfileReport
 from streamlit.components.v1 import html
 
+from utils.data import COMPACT, memory_report, raw_statistics, read_insights
+from utils.datasets import CACHE, DEFAULT_DATASET, cached, dataset_paths, select_dataset
+from utils.figures import FIGURE_CACHE
+from utils.results import HOME_CACHE
+from utils.warmup import load_profile_html
+
 #================= PAGE CONFIG =================
 st.set_page_config(page_title="Online Sales Dashboard", layout="wide",page_icon='online-shop_164427.png')
 
@@ -15,15 +22,44 @@ st.divider()
 # -------------------------------------------------
 # Load Dataset
 # -------------------------------------------------
-df = pd.read_csv("online_sales_dataset.csv")
+def load_raw(dataset):
+    return cached(dataset, "raw", lambda: pd.read_csv(dataset_paths(dataset)[1]))
+
+
+def load_statistics(dataset):
+    return cached(dataset, "raw_statistics", lambda: raw_statistics(load_raw(dataset)))
+
+
+def load_memory_report(dataset):
+    return cached(dataset, "memory_report", lambda: memory_report(read_insights(dataset_paths(dataset)[0], compact=False)))
+
+
+def load_profile(dataset):
+    def build():
+        profile_html = load_profile_html() if dataset == DEFAULT_DATASET else None
+        if profile_html is None:
+            # ydata_profiling is heavy to import; only load it once a report is requested.
+            from ydata_profiling import ProfileReport
+
+            profile = ProfileReport(load_raw(dataset), explorative=True)
+            profile_html = profile.to_html()
+        return profile_html
+
+    return cached(dataset, "profile", build)
+
 
-total_rows = df.shape[0]
-total_cols = df.shape[1]
-missing_total = df.isna().sum().sum()
-duplicate_count = df.duplicated().sum()
+dataset = select_dataset()
 
-missing_percent = (missing_total / (total_rows * total_cols)) * 100
-duplicate_percent = (duplicate_count / total_rows) * 100
+if not os.path.exists(dataset_paths(dataset)[1]):
+    st.warning(f"No raw dataset (`{os.path.basename(dataset_paths(dataset)[1])}`) for **{dataset}**.")
+    st.stop()
+
+stats = load_statistics(dataset)
+
+total_rows = stats["total_rows"]
+total_cols = stats["total_cols"]
+missing_percent = stats["missing_percent"]
+duplicate_percent = stats["duplicate_percent"]
 
 # -------------------------------------------------
 # KPI SECTION
@@ -61,15 +97,101 @@ The dataset is structurally consistent and suitable for performance analysis.
 
 st.divider()
 
+# -------------------------------------------------
+# Memory Footprint
+# -------------------------------------------------
+st.subheader("🧠 Memory Footprint")
+
+report = load_memory_report(dataset)
+
+loaded_mb = report["MB"].sum()
+compact_mb = report["Compact MB"].sum()
+
+m1, m2, m3 = st.columns(3)
+
+m1.metric("Plain Frame", f"{loaded_mb:,.1f} MB")
+m2.metric("Compact Frame", f"{compact_mb:,.1f} MB")
+m3.metric("Reduction", f"{loaded_mb / compact_mb:.1f}×", "target 4×", delta_color="off")
+
+if COMPACT:
+    st.caption("Pages load the compact frame. Set `DASHBOARD_COMPACT=0` to use the plain dtypes.")
+else:
+    st.caption("Compact mode is off (`DASHBOARD_COMPACT=0`); pages load the plain dtypes.")
+
+st.dataframe(
+    report.style.format({"MB": "{:.2f}", "Compact MB": "{:.2f}", "Saving ×": "{:.1f}×"}),
+    use_container_width=True
+)
+
+st.divider()
+
+# -------------------------------------------------
+# Dataset Cache
+# -------------------------------------------------
+st.subheader("🗄️ Dataset Cache")
+
+cache = CACHE.stats()
+
+k1, k2, k3, k4, k5 = st.columns(5)
+
+k1.metric("Hits", f"{cache['hits']:,}")
+k2.metric("Misses", f"{cache['misses']:,}")
+k3.metric("Hit Rate", f"{cache['hit_rate']:.1%}")
+k4.metric("Evicted Datasets", f"{cache['evictions']:,}")
+k5.metric("Resident", f"{cache['nbytes'] / 2**20:,.0f} / {cache['max_bytes'] / 2**20:,.0f} MB")
+
+st.dataframe(
+    pd.DataFrame(
+        [(name, version, size / 2**20) for (name, version), size in reversed(CACHE.groups())],
+        columns=["Dataset", "Version", "MB"]
+    ).style.format({"MB": "{:.1f}"}),
+    use_container_width=True,
+    hide_index=True
+)
+
+st.caption("Most recently used first. Set `DASHBOARD_CACHE_MB` to change the budget.")
+
+views = HOME_CACHE.stats()
+
+v1, v2, v3, v4, v5 = st.columns(5)
+
+v1.metric("Home View Hits", f"{views['hits']:,}")
+v2.metric("Home View Misses", f"{views['misses']:,}")
+v3.metric("Home View Hit Rate", f"{views['hit_rate']:.1%}")
+v4.metric("Evicted Views", f"{views['evictions']:,}")
+v5.metric("Cached Views", f"{views['items']:,} ({views['nbytes'] / 2**20:,.1f} MB)")
+
+st.caption("Home KPIs and previews per (dataset, date range, country, category), shared by all sessions. "
+           "Set `DASHBOARD_RESULTS_MB` to change the budget.")
+
+figures = FIGURE_CACHE.stats()
+
+f1, f2, f3, f4, f5 = st.columns(5)
+
+f1.metric("Figure Hits", f"{figures['hits']:,}")
+f2.metric("Figure Misses", f"{figures['misses']:,}")
+f3.metric("Figure Hit Rate", f"{figures['hit_rate']:.1%}")
+f4.metric("Evicted Figure Sets", f"{figures['evictions']:,}")
+f5.metric("Cached Figures", f"{figures['items']:,} ({figures['nbytes'] / 2**20:,.1f} MB)")
+
+st.caption("Serialised charts per (dataset, chart, parameters), shared by all sessions. "
+           "Set `DASHBOARD_FIGURES_MB` to change the budget.")
+
+st.divider()
+
 # -------------------------------------------------
 # Optional Profiling Report
 # -------------------------------------------------
 st.subheader("📘 Advanced Technical Details")
 
-if st.checkbox("🔍 View Full Profiling Report"):
-    profile = ProfileReport(df, explorative=True)
-    profile_html = profile.to_html()
-    html(profile_html, height=900, scrolling=True)
+# Opening the report reruns only this fragment.
+@st.fragment
+def profiling_report():
+    if st.checkbox("🔍 View Full Profiling Report"):
+        html(load_profile(dataset), height=900, scrolling=True)
+
+
+profiling_report()
 
 # ================= FOOTER =================
 st.markdown("---")
@@ -0,0 +1,155 @@
+import plotly.express as px
+import streamlit as st
+
+from utils.customers import CustomerTable
+from utils.data import read_home
+from utils.datasets import cached, dataset_paths, select_dataset
+from utils.figures import cached_figure
+
+# ================= PAGE CONFIG =================
+st.set_page_config(page_title="Online Sales Dashboard", layout="wide",page_icon='online-shop_164427.png')
+
+
+# ================= LOAD DATA =================
+def load_customers(dataset):
+    return cached(dataset, "customers", lambda: CustomerTable.from_transactions(read_home(dataset_paths(dataset)[0])))
+
+
+def load_kpis(dataset, customers):
+    return cached(dataset, "customer_kpis", customers.kpis)
+
+
+dataset = select_dataset()
+customers = load_customers(dataset)
+kpis = load_kpis(dataset, customers)
+
+
+# ================= TITLE =================
+st.title("👥 Customer Analytics")
+st.caption("Lifetime value, recency, returns and cohort retention per customer")
+
+st.divider()
+
+
+# ================= KPIs =================
+st.subheader("📌 Customer KPIs")
+
+c1, c2, c3, c4 = st.columns(4)
+
+c1.metric("Customers", f"{kpis['customers']:,}")
+c2.metric("Avg Lifetime Revenue", f"{kpis['avg_revenue']:,.0f}")
+c3.metric("Repeat Customers", f"{kpis['repeat_share']:.1%}")
+c4.metric("Avg Recency (days)", f"{kpis['avg_recency_days']:,.0f}")
+
+st.divider()
+
+
+# ================= Customer Lookup =================
+# Each section below is a fragment: its widgets rerun only that section.
+@st.fragment
+def customer_lookup():
+    st.subheader("🔎 Customer Lookup")
+
+    customer_id = st.number_input("Customer ID", value=int(customers.table.index[0]), step=1)
+
+    row = customers.lookup(customer_id)
+
+    if row is None:
+        st.warning("Customer not found.")
+
+    else:
+        m1, m2, m3, m4, m5 = st.columns(5)
+
+        m1.metric("Orders", f"{row['orders']:,}")
+        m2.metric("Lifetime Revenue", f"{row['revenue']:,.0f}")
+        m3.metric("Return Rate", f"{row['return_rate']:.1%}")
+        m4.metric("Recency (days)", f"{row['recency_days']:,}")
+        m5.metric("Cohort", row["cohort"])
+
+        st.caption(f"{row['customer_type']} customer since {row['first_purchase']:%Y-%m-%d}")
+
+
+customer_lookup()
+
+st.divider()
+
+
+# ================= Top Customers =================
+@st.fragment
+def top_customers():
+    st.subheader("🏆 Top Customers")
+
+    c1, c2 = st.columns(2)
+
+    by = c1.radio(
+        "Rank By",
+        ["revenue", "orders", "returns"],
+        format_func=str.title,
+        horizontal=True
+    )
+
+    n = c2.slider("Number of Customers", 5, 50, 10, 5)
+
+    top = customers.top(n, by)
+
+    def build():
+        fig = px.bar(
+            top.reset_index(),
+            x="CustomerID",
+            y=by,
+            color="customer_type",
+            text_auto=True,
+            title=f"Top {n} Customers by {by.title()}"
+        )
+
+        fig.update_xaxes(type="category")
+
+        return fig
+
+    st.plotly_chart(cached_figure(dataset, "top_customers", (n, by), build), use_container_width=True)
+
+    st.dataframe(top, use_container_width=True)
+
+
+top_customers()
+
+st.divider()
+
+
+# ================= Cohort Retention =================
+@st.fragment
+def cohort_retention():
+    st.subheader("📅 Cohort Retention")
+
+    retention = customers.cohort_retention()
+
+    last_age = retention.shape[1] - 1
+
+    if last_age > 3:
+        max_age = st.slider("Months Since First Purchase", 3, last_age, max(3, min(12, last_age)))
+    else:
+        max_age = last_age
+        st.caption("Too few months of data to choose a range; showing all of them.")
+
+    def build():
+        fig = px.imshow(
+            retention.iloc[:, :max_age + 1],
+            text_auto=".0%",
+            aspect="auto",
+            color_continuous_scale="Blues",
+            title="Share of Each Monthly Cohort Active N Months Later"
+        )
+
+        fig.update_layout(height=650)
+
+        return fig
+
+    st.plotly_chart(cached_figure(dataset, "cohort_retention", (max_age,), build), use_container_width=True)
+
+
+cohort_retention()
+
+
+# ================= FOOTER =================
+st.markdown("---")
+st.caption("Customer Analytics | Developed by Eng. Mohamed")
@@ -0,0 +1,108 @@
+"""Benchmark the encoded groupby engine against the pandas path of Bivariate tab 2.
+
+Builds a synthetic frame with object-dtype category columns, then times
+``df.groupby(cat)[metric].<agg>()`` against ``EncodedFrame.aggregate`` for
+every aggregation and checks that both give the same numbers. With
+``--workers`` it also times the partitioned ``ParallelFrame`` at each
+worker count, to check scaling across cores:
+
+    python -m scripts.bench_groupby --rows 5000000
+    python -m scripts.bench_groupby --rows 20000000 --workers 1 2 4 8 16
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.groupby import EncodedFrame
+from utils.parallel import ParallelFrame
+
+
+CATEGORIES = {
+    "category": 5,
+    "country": 40,
+    "paymentmethod": 3,
+    "shipmentprovider": 4,
+    "warehouselocation": 5,
+}
+METRICS = ["Net_Revenue", "quantity", "discount"]
+AGGS = ["sum", "count", "mean", "median"]
+
+
+def synthetic_frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {
+        col: rng.choice(np.array([f"{col}_{i}" for i in range(k)], dtype=object), rows)
+        for col, k in CATEGORIES.items()
+    }
+    data["Net_Revenue"] = rng.gamma(2.0, 300.0, rows)
+    data["quantity"] = rng.integers(1, 50, rows).astype(float)
+    data["discount"] = rng.uniform(0, 0.5, rows).round(2)
+    return pd.DataFrame(data)
+
+
+def _time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, nargs="*", default=[], help="ParallelFrame worker counts")
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.rows)
+
+    start = time.perf_counter()
+    engine = EncodedFrame(df, list(CATEGORIES), METRICS)
+    print(f"{args.rows:,} rows, encoded in {time.perf_counter() - start:.2f}s (once per dataset version)\n")
+
+    print(f"{'aggregation':12s} {'pandas':>10s} {'encoded':>10s} {'speed-up':>9s}")
+
+    for agg in AGGS:
+        pandas_total = engine_total = 0.0
+
+        for cat in CATEGORIES:
+            for metric in METRICS:
+                t_pd, expected = _time(lambda: getattr(df.groupby(cat)[metric], agg)(), args.repeat)
+                t_en, result = _time(lambda: engine.aggregate(cat, metric, agg), args.repeat)
+
+                np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-9)
+                pandas_total += t_pd
+                engine_total += t_en
+
+        print(f"{agg:12s} {pandas_total * 1000:9.1f}ms {engine_total * 1000:9.1f}ms {pandas_total / engine_total:8.1f}x")
+
+    if args.workers:
+        print(f"\n{'workers':>7s} " + " ".join(f"{agg:>10s}" for agg in AGGS))
+
+    baseline = None
+
+    for workers in args.workers:
+        parallel = ParallelFrame(df, list(CATEGORIES), METRICS, workers=workers)
+        parallel.aggregate("country", "Net_Revenue")  # start the pool
+
+        times = []
+        for agg in AGGS:
+            total = 0.0
+            for cat in CATEGORIES:
+                for metric in METRICS:
+                    t, _ = _time(lambda: parallel.aggregate(cat, metric, agg), args.repeat)
+                    total += t
+            times.append(total)
+
+        baseline = baseline or times
+        print(f"{workers:7d} " + " ".join(f"{t * 1000:8.0f}ms" for t in times)
+              + f"   speed-up {sum(baseline) / sum(times):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
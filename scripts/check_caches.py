@@ -0,0 +1,90 @@
+"""Check that the shared caches hold their memory bounds.
+
+Each check fills a cache the way the pages do and fails when an entry
+outlives the cache's limits. The script exits with status 1 on any
+failure:
+
+    python -m scripts.check_caches
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from utils.figures import FIGURE_CACHE
+from utils.lru import LRUCache
+from utils.prefix import PrefixSums
+from utils.results import home_view
+
+
+def check_single_group_eviction():
+    """One dataset version's figures, past both limits, must still be evicted down to them."""
+    # The figure cache's configuration with small limits.
+    cache = LRUCache(
+        max_bytes=1000, max_items=10, group=FIGURE_CACHE._group,
+        sizeof=FIGURE_CACHE.sizeof, evict_entries=FIGURE_CACHE.evict_entries
+    )
+
+    for i in range(500):
+        cache.put(("Default", "v1", "chart", i), "x" * 100)
+
+    found = []
+    if cache.items > cache.max_items or cache.nbytes > cache.max_bytes:
+        found.append(f"{cache.items} figures / {cache.nbytes} bytes resident over a 10 / 1000 bound")
+    if not cache.evictions:
+        found.append("no evictions")
+    if ("Default", "v1", "chart", 499) not in cache:
+        found.append("the newest figure was evicted")
+    return found
+
+
+def check_home_preview_is_standalone():
+    """A cached Home view's preview must own its memory, not view the filtered rows'."""
+    n = 20_000
+    df = pd.DataFrame({
+        "invoicedate": pd.date_range("2024-01-01", periods=n, freq="h"),
+        "country": "France",
+        "category": "Apparel",
+        "Gross_Sales": np.ones(n),
+        "Net_Revenue": np.ones(n),
+        "IsReturned": np.zeros(n),
+        "Total_Order_Value": np.ones(n),
+    })
+
+    view = home_view(df, PrefixSums(df), df["invoicedate"].min(), df["invoicedate"].max(), "France")
+
+    preview = view["preview"]
+    found = []
+
+    for block in preview._mgr.blocks:
+        values = np.asarray(block.values)
+        root = values
+        while isinstance(root.base, np.ndarray):
+            root = root.base
+        if root.nbytes > values.nbytes:
+            found.append(f"{len(preview)} preview rows keep a {root.nbytes:,}-byte buffer alive")
+
+    return found
+
+
+CHECKS = [check_single_group_eviction, check_home_preview_is_standalone]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+
+    failures = 0
+    for check in CHECKS:
+        found = check()
+        failures += bool(found)
+        print(f"{'FAIL' if found else 'OK'} {check.__name__}" + "".join(f"\n    {line}" for line in found))
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Check that incremental CustomerTable updates match a one-shot build.
+
+The transactions are split into consecutive batches. The first batch is
+built with ``from_transactions`` and the rest are folded in with
+``update``. The result must equal ``from_transactions`` over all rows:
+the same per-customer aggregates, activity index and cohort retention.
+The check exits with status 1 on any difference:
+
+    python -m scripts.check_customers
+    python -m scripts.check_customers --splits 12000 8000
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from utils.customers import CustomerTable
+from utils.data import DATA_PATH, read_home
+
+
+def split_build(df, sizes):
+    """``CustomerTable`` of ``df`` built from batches of ``sizes`` rows (the rest in a final batch)."""
+    bounds = np.cumsum([0] + list(sizes))
+    parts = [df.iloc[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+    if bounds[-1] < len(df):
+        parts.append(df.iloc[bounds[-1]:])
+
+    table = CustomerTable.from_transactions(parts[0])
+    for part in parts[1:]:
+        table.update(part)
+    return table
+
+
+def differences(expected, actual):
+    """Descriptions of where ``actual`` differs from ``expected``; empty when equal."""
+    found = []
+
+    try:
+        pd.testing.assert_frame_equal(
+            expected.table.sort_index(), actual.table.sort_index(), check_dtype=False
+        )
+    except AssertionError as e:
+        found.append(f"table: {e}")
+
+    if not np.array_equal(expected.activity, actual.activity):
+        found.append("activity index differs")
+
+    try:
+        pd.testing.assert_frame_equal(expected.cohort_retention(), actual.cohort_retention())
+    except AssertionError as e:
+        found.append(f"cohort retention: {e}")
+
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=DATA_PATH, help="cleaned dataset CSV")
+    parser.add_argument("--splits", type=int, nargs="+", help="batch sizes in rows (default: halves)")
+    args = parser.parse_args()
+
+    df = read_home(args.data)
+    sizes = args.splits or [len(df) // 2]
+
+    found = differences(CustomerTable.from_transactions(df), split_build(df, sizes))
+
+    for line in found:
+        print(f"FAIL {line}")
+
+    if found:
+        sys.exit(1)
+
+    print(f"OK: {len(df):,} rows in batches of {sizes} match the one-shot build")
+
+
+if __name__ == "__main__":
+    main()
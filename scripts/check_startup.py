@@ -0,0 +1,95 @@
+"""Cold-start import-time and memory budget check for every page.
+
+Each page runs once in a fresh interpreter (so nothing is cached or
+already imported). The check fails with exit code 1 when a page takes
+longer or peaks higher than its budget in ``startup_budget.json``, or when
+it imports one of the ``forbidden_modules`` on its default code path:
+
+    python -m scripts.check_startup
+    python -m scripts.check_startup --budget my_budget.json Home.py
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+BUDGET_PATH = os.path.join(os.path.dirname(__file__), "startup_budget.json")
+
+# Runs inside the child interpreter: one cold AppTest run of the page.
+_CHILD = r"""
+import json, resource, sys, time
+
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+
+at = AppTest.from_file(sys.argv[1], default_timeout=300)
+at.run()
+
+seconds = time.perf_counter() - start
+peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+print(json.dumps({
+    "seconds": seconds,
+    "rss_mb": peak_kb / 1024,
+    "modules": sorted({m.split(".")[0] for m in sys.modules}),
+    "exception": [e.value for e in at.exception],
+}))
+"""
+
+
+def measure(page):
+    """Cold-run ``page`` in a new interpreter and return its timings, peak RSS and modules."""
+    result = subprocess.run(
+        [sys.executable, "-c", _CHILD, page],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def check(pages, budget):
+    failures = []
+
+    for page in pages:
+        limits = budget["pages"][page]
+        stats = measure(page)
+
+        loaded = [m for m in budget.get("forbidden_modules", []) if m in stats["modules"]]
+
+        print(f"{page:45s} {stats['seconds']:6.2f}s / {limits['seconds']:.1f}s   "
+              f"{stats['rss_mb']:7.1f}MB / {limits['rss_mb']}MB"
+              + (f"   heavy imports: {', '.join(loaded)}" if loaded else ""))
+
+        if stats["exception"]:
+            failures.append(f"{page}: raised {stats['exception'][0]}")
+        if stats["seconds"] > limits["seconds"]:
+            failures.append(f"{page}: cold start {stats['seconds']:.2f}s over {limits['seconds']}s budget")
+        if stats["rss_mb"] > limits["rss_mb"]:
+            failures.append(f"{page}: peak RSS {stats['rss_mb']:.0f}MB over {limits['rss_mb']}MB budget")
+        if loaded:
+            failures.append(f"{page}: imported {', '.join(loaded)} on startup")
+
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pages", nargs="*", help="pages to check (default: all in the budget)")
+    parser.add_argument("--budget", default=BUDGET_PATH, help="budget JSON file")
+    args = parser.parse_args()
+
+    with open(args.budget, encoding="utf-8") as f:
+        budget = json.load(f)
+
+    failures = check(args.pages or list(budget["pages"]), budget)
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""Render every dashboard chart to static HTML/JSON snapshots.
+
+Walks every column / option combination offered by the Univariate,
+Bivariate and Insights pages, renders the charts in a process pool and
+writes a self-contained viewer (``index.html``) next to them:
+
+    python -m scripts.export_snapshots --out snapshots --workers 8
+    python -m http.server --directory snapshots 8000
+"""
+
+import argparse
+import html
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from utils import charts
+from utils.data import (
+    DATA_PATH, EXCLUDE_COLS, categorical_columns, date_columns, high_cardinality_columns, numeric_columns,
+    read_bivariate, read_dataset, read_insights
+)
+from utils.heavy_hitters import COUNT, MEASURES, HeavyHitters
+from utils.sampling import SAMPLE_SIZES, StratifiedSample
+from utils.stats import correlation_matrix
+
+
+# Bivariate scatter views draw the page's default stratified sample, so snapshots match the page.
+SCATTER_SAMPLE = 2000
+
+# Top-K views are rendered at the pages' default K.
+TOP_K = 10
+
+PAGES = {
+    "univariate": "📊 Univariate",
+    "bivariate": "🔗 Bivariate",
+    "insights": "🚀 Insights & Recommendations",
+}
+
+_frames = {}
+
+
+# ================= Worker =================
+def _init_worker(path):
+    _frames["univariate"] = read_dataset(path)
+    _frames["bivariate"] = read_bivariate(path)
+    _frames["samples"] = StratifiedSample(_frames["bivariate"])
+    _frames["insights"] = read_insights(path)
+    _frames["insight_scatter"] = _frames["insights"].iloc[charts.insight_scatter_rows(_frames["insights"])]
+    _frames["aggregates"] = charts.insight_aggregates(_frames["insights"])
+
+
+def _hitters():
+    # Built on a worker's first top-K job only.
+    if "hitters" not in _frames:
+        df = _frames["bivariate"]
+        _frames["hitters"] = HeavyHitters.from_frame(df, high_cardinality_columns(df))
+    return _frames["hitters"]
+
+
+def _slug(*parts):
+    return re.sub(r"[^A-Za-z0-9]+", "-", "_".join(str(p) for p in parts)).strip("-").lower()
+
+
+def _build(job):
+    """Build the figures of one job; returns ``[(name, title, fig), ...]``."""
+    _, kind, params = job
+
+    if kind == "numeric":
+        df = _frames["univariate"]
+        fig1, fig2 = charts.univariate_numeric(df, params["col"])
+        return [
+            (_slug(kind, params["col"], "distribution"), f"{params['col']} – Distribution", fig1),
+            (_slug(kind, params["col"], "outliers"), f"{params['col']} – Outliers", fig2),
+        ]
+
+    if kind == "categorical":
+        df = _frames["univariate"]
+        counts = charts.category_counts(df, params["col"])
+        fig = charts.univariate_categorical(counts, params["col"])
+        return [(_slug(kind, params["col"]), params["col"], fig)]
+
+    if kind == "scatter":
+        df = _frames["bivariate"]
+        x_col, y_col, chart_type = params["x"], params["y"], params["chart_type"]
+        # The same rows the page shows at its default sample size.
+        sizes = [s for s in SAMPLE_SIZES if s < len(df)]
+        if sizes:
+            sample = SCATTER_SAMPLE if SCATTER_SAMPLE in sizes else sizes[-1]
+            temp = df[[x_col, y_col]].iloc[_frames["samples"].sample(sample)].dropna()
+        else:
+            temp = df[[x_col, y_col]].dropna()
+        fig = charts.numeric_scatter(temp, x_col, y_col, chart_type)
+        return [(_slug(kind, x_col, y_col, chart_type), f"{x_col} vs {y_col} ({chart_type})", fig)]
+
+    if kind == "correlation":
+        df = _frames["bivariate"]
+        fig = charts.correlation_heatmap(correlation_matrix(df, numeric_columns(df)))
+        return [(_slug(kind), "Correlation Matrix", fig)]
+
+    if kind in ("heavy_hitters", "top_items"):
+        hitters = _hitters()
+        col, by = params["col"], params["by"]
+        if kind == "heavy_hitters":
+            fig = charts.heavy_hitters_bar(hitters.top(col, by, TOP_K).iloc[:-1], col, by)
+        else:
+            top = hitters.top_items(col, by, TOP_K)
+            other_by = next(m for m in hitters.measures if m != by)
+            fig = charts.heavy_hitters_bar(top.iloc[:-1], col, by, color=other_by)
+        return [(_slug(kind, col, by), f"Top {TOP_K} {col} by {by}", fig)]
+
+    if kind == "category":
+        df = _frames["bivariate"]
+        cat, metric, agg = params["cat"], params["metric"], params["agg"]
+        temp = charts.category_aggregate(df, cat, metric, agg)
+        fig = charts.category_bar(temp, cat, metric, agg)
+        return [(_slug(kind, cat, metric, agg), f"{agg} {metric} by {cat}", fig)]
+
+    if kind == "time":
+        df = _frames["bivariate"]
+        date_col, metric, agg, grain = params["date_col"], params["metric"], params["agg"], params["grain"]
+        temp = charts.time_aggregate(df, date_col, metric, agg, grain)
+        fig = charts.time_line(temp, metric, agg)
+        parts = (kind, date_col, metric, agg) if grain == "Month" else (kind, date_col, metric, agg, grain)
+        return [(_slug(*parts), f"{agg} {metric} over {date_col} by {grain}", fig)]
+
+    # Insights questions
+    chart_id = params["chart_id"]
+    fig = charts.INSIGHT_CHARTS[chart_id](_frames["aggregates"].get(chart_id, _frames["insight_scatter"]))
+    return [(chart_id, fig.layout.title.text or chart_id, fig)]
+
+
+def _render(job, out_dir):
+    page = job[0]
+    page_dir = os.path.join(out_dir, page)
+    os.makedirs(page_dir, exist_ok=True)
+
+    entries = []
+    for name, title, fig in _build(job):
+        fig.write_html(os.path.join(page_dir, f"{name}.html"), include_plotlyjs="cdn", full_html=True)
+        with open(os.path.join(page_dir, f"{name}.json"), "w", encoding="utf-8") as f:
+            f.write(fig.to_json())
+        entries.append({"page": page, "title": title, "html": f"{page}/{name}.html", "json": f"{page}/{name}.json"})
+
+    return entries
+
+
+# ================= Jobs =================
+def list_jobs(path=DATA_PATH):
+    """Enumerate every (page, chart kind, parameters) combination the pages can show."""
+    uni = read_dataset(path)
+    bi = read_bivariate(path)
+
+    jobs = []
+
+    for col in numeric_columns(uni):
+        jobs.append(("univariate", "numeric", {"col": col}))
+    for col in categorical_columns(uni, exclude=EXCLUDE_COLS):
+        jobs.append(("univariate", "categorical", {"col": col}))
+
+    # Heavy hitters are built from the Bivariate frame on both pages.
+    heavy_cols = high_cardinality_columns(bi)
+    measures = [m for m in MEASURES if m == COUNT or m in bi.columns]
+    for col in heavy_cols:
+        for by in measures:
+            jobs.append(("univariate", "heavy_hitters", {"col": col, "by": by}))
+            if len(measures) > 1:
+                jobs.append(("bivariate", "top_items", {"col": col, "by": by}))
+
+    num_cols = numeric_columns(bi)
+    if len(num_cols) > 1:
+        jobs.append(("bivariate", "correlation", {}))
+
+    for x_col in num_cols:
+        for y_col in num_cols:
+            if y_col == x_col:
+                continue
+            for chart_type in charts.NUMERIC_CHART_TYPES:
+                jobs.append(("bivariate", "scatter", {"x": x_col, "y": y_col, "chart_type": chart_type}))
+
+    for cat in categorical_columns(bi):
+        for metric in num_cols:
+            for agg in charts.CATEGORY_AGGS:
+                jobs.append(("bivariate", "category", {"cat": cat, "metric": metric, "agg": agg}))
+
+    for date_col in date_columns(bi):
+        for metric in num_cols:
+            for agg in charts.TIME_AGGS:
+                for grain in charts.TIME_GRAINS:
+                    jobs.append(("bivariate", "time", {"date_col": date_col, "metric": metric, "agg": agg, "grain": grain}))
+
+    for chart_id in charts.INSIGHT_CHARTS:
+        jobs.append(("insights", "insight", {"chart_id": chart_id}))
+
+    return jobs
+
+
+# ================= Viewer =================
+def write_viewer(out_dir, entries):
+    """Write ``manifest.json`` and a single-file ``index.html`` that browses the snapshots."""
+    entries = sorted(entries, key=lambda e: (list(PAGES).index(e["page"]), e["title"]))
+
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=1)
+
+    sections = []
+    for page, label in PAGES.items():
+        links = "\n".join(
+            f'<li><a href="{html.escape(e["html"])}" target="chart">{html.escape(e["title"])}</a></li>'
+            for e in entries if e["page"] == page
+        )
+        sections.append(f"<details open><summary>{html.escape(label)}</summary><ul>{links}</ul></details>")
+
+    first = entries[0]["html"] if entries else "about:blank"
+
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Online Sales Dashboard – Snapshots</title>
+<style>
+body {{ margin:0; display:flex; height:100vh; font-family:sans-serif; }}
+nav {{ width:320px; overflow-y:auto; padding:10px; background:#111827; color:#e5e7eb; font-size:13px; }}
+nav a {{ color:#93c5fd; text-decoration:none; }}
+nav ul {{ padding-left:16px; }}
+iframe {{ flex:1; border:0; }}
+</style>
+</head>
+<body>
+<nav>
+<h3>📊 Online Sales Dashboard</h3>
+<p>Generated {time.strftime("%Y-%m-%d %H:%M")} · {len(entries)} charts</p>
+{"".join(sections)}
+</nav>
+<iframe name="chart" src="{html.escape(first)}"></iframe>
+</body>
+</html>
+""")
+
+
+# ================= Export =================
+def export(path=DATA_PATH, out_dir="snapshots", workers=None):
+    jobs = list_jobs(path)
+    os.makedirs(out_dir, exist_ok=True)
+
+    entries = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(path,)) as pool:
+        futures = [pool.submit(_render, job, out_dir) for job in jobs]
+        for future in as_completed(futures):
+            entries.extend(future.result())
+
+    write_viewer(out_dir, entries)
+
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=DATA_PATH, help="dataset to render")
+    parser.add_argument("--out", default="snapshots", help="output directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    entries = export(args.data, args.out, args.workers)
+
+    print(f"Exported {len(entries)} charts to {args.out}/ in {time.perf_counter() - start:.1f}s "
+          f"with {args.workers} workers")
+
+
+if __name__ == "__main__":
+    main()
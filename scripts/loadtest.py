@@ -0,0 +1,463 @@
+"""Load-test a dashboard server with concurrent simulated analyst sessions.
+
+For each concurrency level a fresh ``streamlit run`` server is started on a
+synthetic dataset in a temporary directory (nothing in the working tree is
+read or written). N sessions then connect over Streamlit's websocket
+protocol, like N browser tabs. Each visits every page in turn and walks a
+scripted interaction sequence on it: filters, columns, aggregations and
+granularities. Like the browser, a change to a widget inside an
+``st.fragment`` reruns only that fragment; every other change reruns the
+whole page. Every rerun is timed from the widget change to the server's
+"script finished" message. The tool reports p50/p95/p99 rerun latency,
+throughput and the server's peak resident memory per level:
+
+    python -m scripts.loadtest                              # 1, 2, 4 and 8 sessions
+    python -m scripts.loadtest --sessions 1 4 16 --rows 200000 --rounds 3
+    python -m scripts.loadtest --pages Home Bivariate --think 2 --json loadtest.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGE_ICON = "online-shop_164427.png"
+
+COUNTRIES = [
+    "United Kingdom", "France", "Germany", "Spain", "Italy", "Portugal",
+    "Netherlands", "Belgium", "Sweden", "Norway", "Australia", "United States"
+]
+CATEGORIES = ["Electronics", "Apparel", "Furniture", "Accessories", "Stationery"]
+
+
+# ================= Synthetic Data =================
+def synthetic_dataset(root, rows, seed=0):
+    """Write a cleaned and a raw dataset of ``rows`` random orders under ``root``."""
+    rng = np.random.default_rng(seed)
+
+    dates = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 5 * 365 * 24 * 60, rows), unit="min")
+
+    df = pd.DataFrame({
+        "invoiceno": rng.integers(100000, 999999, rows),
+        "stockcode": [f"SKU_{i}" for i in rng.integers(1000, 3000, rows)],
+        "description": rng.choice([f"Item {i}" for i in range(300)], rows),
+        "quantity": rng.integers(1, 50, rows),
+        "invoicedate": dates,
+        "unitprice": rng.uniform(1, 100, rows).round(2),
+        "customerid": rng.integers(10000, 20000, rows).astype(float),
+        "country": rng.choice(COUNTRIES, rows),
+        "discount": rng.uniform(0, 0.5, rows).round(2),
+        "paymentmethod": rng.choice(["Credit Card", "PayPal", "Bank Transfer"], rows),
+        "shippingcost": rng.uniform(5, 30, rows).round(2),
+        "category": rng.choice(CATEGORIES, rows),
+        "saleschannel": rng.choice(["Online", "In-store"], rows),
+        "returnstatus": rng.choice(["Returned", "Not Returned"], rows, p=[0.1, 0.9]),
+        "shipmentprovider": rng.choice(["DHL", "UPS", "FedEx", "Royal Mail"], rows),
+        "warehouselocation": rng.choice(["London", "Paris", "Berlin", "Rome", "Amsterdam"], rows),
+        "orderpriority": rng.choice(["High", "Medium", "Low"], rows),
+    }).sort_values("invoicedate")
+
+    raw = df.copy()
+    raw.columns = [
+        "InvoiceNo", "StockCode", "Description", "Quantity", "InvoiceDate", "UnitPrice", "CustomerID",
+        "Country", "Discount", "PaymentMethod", "ShippingCost", "Category", "SalesChannel",
+        "ReturnStatus", "ShipmentProvider", "WarehouseLocation", "OrderPriority"
+    ]
+    raw.to_csv(os.path.join(root, "online_sales_dataset.csv"), index=False)
+
+    df["Gross_Sales"] = df["quantity"] * df["unitprice"]
+    df["Net_Revenue"] = df["Gross_Sales"] * (1 - df["discount"])
+    df["Total_Order_Value"] = df["Net_Revenue"] + df["shippingcost"]
+    df["Shipping_Ratio"] = df["shippingcost"] / df["Total_Order_Value"]
+    df["IsReturned"] = (df["returnstatus"] == "Returned").astype(int)
+    df["Year"] = df["invoicedate"].dt.year
+    df["Month"] = df["invoicedate"].dt.month
+    df["Month_Name"] = df["invoicedate"].dt.strftime("%B")
+    df["Customer_Type"] = rng.choice(["Registered", "Guest"], rows, p=[0.7, 0.3])
+
+    df.to_csv(os.path.join(root, "cleaned_dataset.csv"), index=False)
+
+
+# ================= Server =================
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workdir, port, timeout=120):
+    """``streamlit run Home.py`` serving ``workdir``'s dataset; returns once it is healthy."""
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, "Home.py"),
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--server.fileWatcherType", "none",
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as r:
+                if r.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.2)
+
+    server.kill()
+    raise RuntimeError(f"server on port {port} did not become healthy within {timeout}s")
+
+
+def rss_mb(pid):
+    """Resident memory of process ``pid`` in MB (Linux), else NaN."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("nan")
+
+
+# ================= Client =================
+class Session:
+    """One browser tab: a websocket session that reruns pages with widget states."""
+
+    def __init__(self, url):
+        self.url = url
+        self.pages = {}
+        self.widgets = {}
+        self.fragments = {}
+        self.states = {}
+        self.page = ""
+        self.fragment = ""
+
+    async def connect(self):
+        from tornado.websocket import websocket_connect
+
+        self.ws = await websocket_connect(self.url, max_message_size=1 << 30)
+
+    def close(self):
+        self.ws.close()
+
+    async def rerun(self):
+        """Rerun the current page (or only the fragment of the last changed widget).
+
+        Returns (seconds, error, fragment rerun).
+        """
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        fragment, self.fragment = self.fragment, ""
+
+        msg = BackMsg()
+        msg.rerun_script.page_script_hash = self.page
+        msg.rerun_script.fragment_id = fragment
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+
+        start = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+
+        # A fragment rerun only resends the fragment's elements.
+        if not fragment:
+            self.widgets = {}
+            self.fragments = {}
+        error = False
+
+        while True:
+            raw = await self.ws.read_message()
+            if raw is None:
+                raise ConnectionError("server closed the session")
+
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            kind = fwd.WhichOneof("type")
+
+            if kind == "new_session":
+                self.pages = {p.page_name: p.page_script_hash for p in fwd.new_session.app_pages}
+
+            elif kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                field = element.WhichOneof("type")
+                proto = getattr(element, field) if field else None
+                if field == "exception":
+                    error = True
+                elif proto is not None and hasattr(proto, "id") and hasattr(proto, "label"):
+                    self.widgets[proto.id] = (field, proto)
+                    self.fragments[proto.id] = fwd.delta.fragment_id
+
+            elif kind == "script_finished":
+                if fwd.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    error = True
+                return time.perf_counter() - start, error, bool(fragment)
+
+    def goto(self, page):
+        """Switch page; like the browser, widget states of the old page are dropped."""
+        self.page = self.pages.get(page, "")
+        self.states = {}
+        self.fragment = ""
+
+    def find(self, label=None, key=None):
+        for widget_id, (field, proto) in self.widgets.items():
+            if (key is not None and widget_id.endswith(f"-{key}")) or (label is not None and proto.label == label):
+                return field, proto
+        return None, None
+
+    def set(self, state):
+        """Change a widget; the next rerun is limited to its fragment, if it has one."""
+        self.states[state.id] = state
+        self.fragment = self.fragments.get(state.id, "")
+
+
+# ================= Interactions =================
+def _state(proto, **value):
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    return WidgetState(id=proto.id, **value)
+
+
+def choose(label=None, key=None):
+    """Pick a random option of a selectbox, radio or select slider."""
+    def action(session, rng):
+        from streamlit.proto.Common_pb2 import DoubleArray
+
+        field, proto = session.find(label, key)
+        if proto is None or not proto.options:
+            return False
+        i = int(rng.integers(len(proto.options)))
+        if field == "slider":
+            session.set(_state(proto, double_array_value=DoubleArray(data=[i])))
+        else:
+            session.set(_state(proto, int_value=i))
+        return True
+    return action
+
+
+def slide(label=None, key=None):
+    def action(session, rng):
+        from streamlit.proto.Common_pb2 import DoubleArray
+
+        _, proto = session.find(label, key)
+        if proto is None:
+            return False
+        steps = int((proto.max - proto.min) // proto.step)
+        value = proto.min + proto.step * int(rng.integers(steps + 1))
+        session.set(_state(proto, double_array_value=DoubleArray(data=[value])))
+        return True
+    return action
+
+
+def date_range(session, rng):
+    from streamlit.proto.Common_pb2 import StringArray
+
+    _, start = session.find("Start Date")
+    _, end = session.find("End Date")
+    if start is None or end is None:
+        return False
+
+    lo, hi = pd.Timestamp(start.min), pd.Timestamp(end.max)
+    first = lo + (hi - lo) * rng.uniform(0, 0.8)
+    last = first + (hi - first) * rng.uniform(0.2, 1)
+
+    session.set(_state(start, string_array_value=StringArray(data=[f"{first:%Y/%m/%d}"])))
+    session.set(_state(end, string_array_value=StringArray(data=[f"{last:%Y/%m/%d}"])))
+    return True
+
+
+def toggle(label):
+    def action(session, rng):
+        _, proto = session.find(label)
+        if proto is None:
+            return False
+        current = session.states[proto.id].bool_value if proto.id in session.states else proto.default
+        session.set(_state(proto, bool_value=not current))
+        return True
+    return action
+
+
+# What an analyst does on each page after it loads.
+SCENARIOS = {
+    "Home": [
+        choose("Select Country"),
+        choose("Select Category"),
+        date_range,
+        choose("Compare With"),
+        slide("Number of Rows"),
+        choose("Select Country"),
+    ],
+    "Univariate": [
+        choose("Select Column"),
+        choose("Select Analysis Type"),
+        choose("Select Column"),
+    ],
+    "Bivariate": [
+        choose(key="num_x"),
+        choose(key="num_sample"),
+        choose(key="cat_x"),
+        choose(key="cat_agg"),
+        choose(key="time_metric"),
+        choose(key="time_grain"),
+        choose(key="top_col"),
+        choose(key="top_by"),
+    ],
+    "Insights & Recommendations": [
+        choose(key="q7_grain"),
+        toggle("📐 Show statistical confidence (bootstrap CIs and permutation tests)"),
+        choose(key="q7_grain"),
+    ],
+    "Dataset Issues & Report": [],
+    "Customer Analytics": [
+        choose("Rank By"),
+        slide("Number of Customers"),
+        slide("Months Since First Purchase"),
+    ],
+}
+
+
+async def analyst(url, pages, rounds, seed, think, samples):
+    """One session: every page in a random order, ``rounds`` times; appends (page, seconds, error, fragment)."""
+    rng = np.random.default_rng(seed)
+    session = Session(url)
+    await session.connect()
+
+    try:
+        await session.rerun()  # the landing page, before page names are known
+
+        for _ in range(rounds):
+            for page in rng.permutation(pages):
+                session.goto(page)
+
+                for step in [None] + SCENARIOS.get(page, []):
+                    if step is not None and not step(session, rng):
+                        continue
+
+                    samples.append((page, *await session.rerun()))
+
+                    if think:
+                        await asyncio.sleep(rng.uniform(0, think))
+    finally:
+        session.close()
+
+
+# ================= Levels =================
+def _percentiles(values):
+    p = np.percentile(values, [50, 95, 99]) * 1000 if len(values) else [float("nan")] * 3
+    return {"p50_ms": round(p[0], 1), "p95_ms": round(p[1], 1), "p99_ms": round(p[2], 1)}
+
+
+async def _run_sessions(url, n_sessions, pages, rounds, seed, think, samples, pid, peak):
+    async def sample_rss():
+        while True:
+            peak[0] = max(peak[0], rss_mb(pid))
+            await asyncio.sleep(0.2)
+
+    sampler = asyncio.ensure_future(sample_rss())
+    try:
+        await asyncio.gather(*(analyst(url, pages, rounds, seed + i, think, samples) for i in range(n_sessions)))
+    finally:
+        sampler.cancel()
+
+
+def run_level(workdir, n_sessions, pages, rounds, seed=0, think=0.0, warm=True):
+    """Start a server, run ``n_sessions`` concurrent sessions and return their latency, throughput and memory."""
+    port = free_port()
+    server = start_server(workdir, port)
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+
+    try:
+        if warm:
+            # One unmeasured pass, so the levels compare steady state rather than cache builds.
+            asyncio.run(_run_sessions(url, 1, pages, 1, seed, 0.0, [], server.pid, [0.0]))
+
+        samples = []
+        peak = [rss_mb(server.pid)]
+
+        began = time.perf_counter()
+        asyncio.run(_run_sessions(url, n_sessions, pages, rounds, seed, think, samples, server.pid, peak))
+        wall = time.perf_counter() - began
+    finally:
+        server.terminate()
+        server.wait()
+
+    seconds = np.array([s for _, s, _, _ in samples])
+
+    return {
+        "sessions": n_sessions,
+        "reruns": len(samples),
+        "fragment_reruns": sum(f for _, _, _, f in samples),
+        "errors": sum(e for _, _, e, _ in samples),
+        "throughput": round(len(samples) / wall, 2),
+        **_percentiles(seconds),
+        "peak_rss_mb": round(peak[0], 1),
+        "pages": {page: _percentiles(np.array([s for p, s, _, _ in samples if p == page])) for page in pages},
+        "full": _percentiles(np.array([s for _, s, _, f in samples if not f])),
+        "fragment": _percentiles(np.array([s for _, s, _, f in samples if f])),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8], help="concurrency levels")
+    parser.add_argument("--rows", type=int, default=50_000, help="rows of the synthetic dataset")
+    parser.add_argument("--rounds", type=int, default=2, help="visits of every page per session")
+    parser.add_argument("--pages", nargs="*", help="page names to visit (default: all)")
+    parser.add_argument("--think", type=float, default=0.0, help="max seconds between interactions")
+    parser.add_argument("--cold", action="store_true", help="skip the unmeasured warm-up pass")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--by-page", action="store_true", help="also print per-page percentiles")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    pages = args.pages or list(SCENARIOS)
+
+    workdir = tempfile.mkdtemp(prefix="dashboard-loadtest-")
+    synthetic_dataset(workdir, args.rows, args.seed)
+    shutil.copy(os.path.join(ROOT, PAGE_ICON), workdir)
+
+    print(f"{args.rows:,} synthetic rows, {len(pages)} pages, {args.rounds} rounds per session\n")
+    print(f"{'sessions':>8s} {'reruns':>7s} {'frag':>5s} {'errors':>6s} {'reruns/s':>9s} "
+          f"{'p50':>9s} {'p95':>9s} {'p99':>9s} {'peak RSS':>10s}")
+
+    results = []
+
+    try:
+        for n in args.sessions:
+            level = run_level(workdir, n, pages, args.rounds, args.seed, args.think, warm=not args.cold)
+            results.append(level)
+
+            print(f"{n:8d} {level['reruns']:7d} {level['fragment_reruns']:5d} {level['errors']:6d} {level['throughput']:9.1f} "
+                  f"{level['p50_ms']:7.0f}ms {level['p95_ms']:7.0f}ms {level['p99_ms']:7.0f}ms "
+                  f"{level['peak_rss_mb']:8.0f}MB", flush=True)
+
+            if args.by_page:
+                for kind in ("full", "fragment"):
+                    p = level[kind]
+                    print(f"{'':8s}   {kind + ' reruns':30s} p50 {p['p50_ms']:7.0f}ms  p95 {p['p95_ms']:7.0f}ms")
+                for page, p in level["pages"].items():
+                    print(f"{'':8s}   {page:30s} p50 {p['p50_ms']:7.0f}ms  p95 {p['p95_ms']:7.0f}ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"rows": args.rows, "rounds": args.rounds, "think": args.think, "levels": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
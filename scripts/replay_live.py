@@ -0,0 +1,50 @@
+"""Replay the cleaned dataset into the live transactions file.
+
+Stand-in for a real order stream during development: appends rows of
+``cleaned_dataset.csv`` to ``live_transactions.csv`` at a fixed rate, with
+``invoicedate`` set to the time of writing, for the Home page live mode:
+
+    python -m scripts.replay_live                  # 20 rows/s
+    python -m scripts.replay_live --rate 500 --reset
+"""
+
+import argparse
+import os
+import time
+
+import pandas as pd
+
+from utils.data import DATA_PATH
+from utils.live import LIVE_PATH
+
+
+def replay(source=DATA_PATH, target=LIVE_PATH, rate=20.0, tick=1.0, reset=False):
+    if reset and os.path.exists(target):
+        os.remove(target)
+
+    per_tick = max(1, int(rate * tick))
+    header = not os.path.exists(target)
+
+    for chunk in pd.read_csv(source, chunksize=per_tick):
+        chunk["invoicedate"] = pd.Timestamp.now().floor("s")
+        chunk.to_csv(target, mode="a", header=header, index=False)
+        header = False
+
+        print(f"Appended {len(chunk)} rows", flush=True)
+        time.sleep(tick)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default=DATA_PATH, help="dataset to replay")
+    parser.add_argument("--target", default=LIVE_PATH, help="live transactions file")
+    parser.add_argument("--rate", type=float, default=20.0, help="rows per second")
+    parser.add_argument("--tick", type=float, default=1.0, help="seconds between appends")
+    parser.add_argument("--reset", action="store_true", help="start a new live file")
+    args = parser.parse_args()
+
+    replay(args.source, args.target, args.rate, args.tick, args.reset)
+
+
+if __name__ == "__main__":
+    main()
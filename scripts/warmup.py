@@ -0,0 +1,62 @@
+"""Keep the dashboard caches warm across dataset changes.
+
+Polls ``cleaned_dataset.csv`` and ``online_sales_dataset.csv``; when either
+changes it rebuilds every page artifact (frames, Insights aggregates,
+statistics, profiling report) in a background process and switches the
+pages over atomically once the build has finished:
+
+    python -m scripts.warmup                 # watch, poll every 5s
+    python -m scripts.warmup --once          # build once (e.g. in a deploy hook)
+    python -m scripts.warmup --hash          # reuse the snapshot when only mtimes changed
+"""
+
+import argparse
+import multiprocessing
+import time
+
+from utils.warmup import WARM_DIR, build, current_version, prune, read_pointer
+
+
+def _build(root, profile, use_hash):
+    pointer = build(root, profile=profile, use_hash=use_hash)
+    prune(root)
+    print(f"Warmed {pointer['version']} in {pointer['seconds']}s", flush=True)
+
+
+def watch(root=WARM_DIR, interval=5.0, profile=True, use_hash=False):
+    worker = None
+
+    while True:
+        pointer = read_pointer(root)
+        stale = pointer is None or pointer["version"] != current_version()
+
+        if worker is not None and not worker.is_alive():
+            if worker.exitcode != 0:
+                print(f"Warm-up failed (exit code {worker.exitcode}), retrying", flush=True)
+            worker = None
+
+        if stale and worker is None:
+            print(f"Dataset changed, warming {current_version()}", flush=True)
+            worker = multiprocessing.Process(target=_build, args=(root, profile, use_hash), daemon=True)
+            worker.start()
+
+        time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", default=WARM_DIR, help="warm cache directory")
+    parser.add_argument("--interval", type=float, default=5.0, help="poll interval in seconds")
+    parser.add_argument("--once", action="store_true", help="build once and exit")
+    parser.add_argument("--hash", action="store_true", help="on an mtime change, hash the files and reuse the snapshot if their content is unchanged")
+    parser.add_argument("--no-profile", action="store_true", help="skip the profiling report")
+    args = parser.parse_args()
+
+    if args.once:
+        _build(args.dir, not args.no_profile, args.hash)
+    else:
+        watch(args.dir, args.interval, not args.no_profile, args.hash)
+
+
+if __name__ == "__main__":
+    main()
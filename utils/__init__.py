@@ -0,0 +1 @@
+"""Shared helpers for the Online Sales Dashboard pages and scripts."""
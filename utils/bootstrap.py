@@ -0,0 +1,180 @@
+"""Bootstrap confidence intervals and permutation tests, batched in NumPy.
+
+Resamples are drawn as index matrices (one row per resample) in chunks
+sized to a memory budget, and reduced per group with a single
+``np.bincount`` over offset group codes, so there is no Python loop per
+resample. Large jobs are split into independently seeded tasks and run
+across a process pool; results are reproducible for a given seed
+whatever the number of workers.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.groupby import encode
+
+
+# Index-matrix elements materialised at once per worker (~64MB of int64 indices).
+CHUNK_BUDGET = 8_000_000
+
+# Below this many resampled elements in total, a process pool costs more than it saves.
+PARALLEL_THRESHOLD = 200_000_000
+
+# Resamples per seeded task. Fixed, so results do not depend on the worker count.
+TASK_SIZE = 100
+
+# Arrays of the current job inside a pool worker (set by the pool initializer only).
+_shared = {}
+
+
+# ================= Workers =================
+def _init(arrays):
+    _shared.clear()
+    _shared.update(arrays)
+
+
+def _bootstrap_task(seed, size, budget, arrays=None):
+    arrays = _shared if arrays is None else arrays
+    codes, values, k = arrays["codes"], arrays["values"], arrays["k"]
+    n = len(codes)
+    rng = np.random.default_rng(seed)
+
+    sums = np.empty((size, k))
+    counts = np.empty((size, k))
+    step = max(1, budget // n)
+
+    for start in range(0, size, step):
+        b = min(step, size - start)
+        idx = rng.integers(0, n, size=(b, n), dtype=np.int32 if n < 2**31 else np.int64)
+        flat = (codes[idx] + (np.arange(b) * k)[:, None]).ravel()
+        sums[start:start + b] = np.bincount(flat, weights=values[idx].ravel(), minlength=b * k).reshape(b, k)
+        counts[start:start + b] = np.bincount(flat, minlength=b * k).reshape(b, k)
+
+    return sums, counts
+
+
+def _permutation_task(seed, size, budget, arrays=None):
+    arrays = _shared if arrays is None else arrays
+    values, labels = arrays["values"], arrays["labels"]
+    n = len(values)
+    rng = np.random.default_rng(seed)
+
+    n1 = labels.sum()
+    total = values.sum()
+    diffs = np.empty(size)
+    step = max(1, budget // n)
+
+    for start in range(0, size, step):
+        b = min(step, size - start)
+        permuted = rng.permuted(np.broadcast_to(labels, (b, n)), axis=1)
+        s1 = permuted @ values
+        diffs[start:start + b] = s1 / n1 - (total - s1) / (n - n1)
+
+    return diffs
+
+
+def _run(task, n_items, n_resamples, seed, workers, budget, **arrays):
+    """Split ``n_resamples`` into seeded tasks and gather their results in order."""
+    workers = workers or os.cpu_count() or 1
+    parallel = workers > 1 and n_items * n_resamples >= PARALLEL_THRESHOLD
+
+    sizes = [min(TASK_SIZE, n_resamples - start) for start in range(0, n_resamples, TASK_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if not parallel:
+        # Passed explicitly: concurrent sessions run this in the same process.
+        return [task(s, size, budget, arrays) for s, size in zip(seeds, sizes)]
+
+    # "spawn" keeps workers independent of the (multithreaded) Streamlit server process.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init, initargs=(arrays,)) as pool:
+        return list(pool.map(task, seeds, sizes, [budget] * len(sizes)))
+
+
+# ================= Public API =================
+def bootstrap_groups(codes, values, k, n_resamples=2000, seed=0, workers=None, budget=CHUNK_BUDGET):
+    """Per-group sums and counts for ``n_resamples`` bootstrap resamples of the rows.
+
+    ``codes`` are integer group codes in ``[0, k)``. Returns two arrays of
+    shape ``(n_resamples, k)``; divide them for resampled group means.
+    """
+    results = _run(
+        _bootstrap_task, len(codes), n_resamples, seed, workers, budget,
+        codes=np.asarray(codes, dtype=np.int64), values=np.asarray(values, dtype=float), k=k
+    )
+    return np.vstack([r[0] for r in results]), np.vstack([r[1] for r in results])
+
+
+def permutation_test(values, labels, n_permutations=2000, seed=0, workers=None, budget=CHUNK_BUDGET):
+    """Two-sided permutation test for the difference in means between two groups.
+
+    ``labels`` is a boolean array marking the first group. Returns the
+    observed difference (first minus second group) and the p-value.
+    """
+    values = np.asarray(values, dtype=float)
+    labels = np.asarray(labels, dtype=bool)
+
+    observed = values[labels].mean() - values[~labels].mean()
+
+    results = _run(
+        _permutation_task, len(values), n_permutations, seed, workers, budget,
+        values=values, labels=labels.astype(float)
+    )
+    diffs = np.concatenate(results)
+
+    p_value = (np.sum(np.abs(diffs) >= abs(observed)) + 1) / (len(diffs) + 1)
+
+    return observed, p_value
+
+
+def confidence_interval(samples, level=0.95, axis=0):
+    """Percentile interval of bootstrap ``samples`` along ``axis``."""
+    alpha = (1 - level) / 2
+    return np.nanquantile(samples, alpha, axis=axis), np.nanquantile(samples, 1 - alpha, axis=axis)
+
+
+# ================= Insights =================
+def _revenue_winner(df, col, n_resamples, seed, workers):
+    temp = df[[col, "Net_Revenue"]].dropna()
+    codes, labels = encode(temp[col])
+
+    sums, _ = bootstrap_groups(codes, temp["Net_Revenue"].to_numpy(), len(labels), n_resamples, seed, workers)
+    low, high = confidence_interval(sums)
+
+    wins = np.bincount(sums.argmax(axis=1), minlength=len(labels)) / len(sums)
+
+    table = pd.DataFrame({
+        col: labels,
+        "Net_Revenue": np.bincount(codes, weights=temp["Net_Revenue"].to_numpy(), minlength=len(labels)),
+        "CI Low": low,
+        "CI High": high,
+        "Top In % of Resamples": wins * 100,
+    })
+
+    return table.sort_values("Net_Revenue", ascending=False).reset_index(drop=True)
+
+
+def insight_uncertainty(df, n_resamples=1000, seed=0, workers=None):
+    """Bootstrap CIs and permutation tests behind the Insights Q1, Q2 and Q4 claims."""
+    temp = df[["discount", "IsReturned"]].dropna()
+    returned = temp["IsReturned"].to_numpy() == 1
+    discount = temp["discount"].to_numpy()
+
+    # Q1: mean discount of returned minus not-returned orders.
+    sums, counts = bootstrap_groups(returned.astype(int), discount, 2, n_resamples, seed, workers)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        diffs = sums[:, 1] / counts[:, 1] - sums[:, 0] / counts[:, 0]
+    low, high = confidence_interval(diffs)
+
+    observed, p_value = permutation_test(discount, returned, n_resamples, seed, workers)
+
+    return {
+        "discount_returns": {"diff": observed, "ci": (low, high), "p_value": p_value},
+        "category_revenue": _revenue_winner(df, "category", n_resamples, seed, workers),
+        "channel_revenue": _revenue_winner(df, "saleschannel", n_resamples, seed, workers),
+        "n_resamples": n_resamples,
+    }
@@ -0,0 +1,572 @@
+"""Chart builders shared by the pages and the static snapshot exporter.
+
+Each builder takes the loaded frame plus the widget selections and returns
+the Plotly figure (and, where a page needs it, the aggregated data behind
+it), so a page rerun and an offline export draw exactly the same chart.
+"""
+
+import calendar
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from utils.crossfilter import CrossFilter
+from utils.downsample import POINT_BUDGET, downsample
+from utils.parallel import PARALLEL_ROWS, aggregation_engine
+from utils.sampling import SAMPLE_SIZES, StratifiedSample
+
+
+PIE_COLS = [
+    "Customer_Type",
+    "orderpriority",
+    "shipmentprovider",
+    "category",
+    "paymentmethod",
+    "returnstatus",
+    "saleschannel"
+]
+
+NUMERIC_CHART_TYPES = [
+    "Correlation Scatter",
+    #"Regression Line",
+    "Distribution View",
+    #"Density Heatmap"
+]
+CATEGORY_AGGS = ["Mean", "Sum", "Median"]
+TIME_AGGS = ["Mean", "Sum"]
+
+# Trend granularity -> (period column, frequency)
+TIME_GRAINS = {
+    "Month": ("YearMonth", "M"),
+    "Day": ("Date", "D"),
+    "Hour": ("Hour", "h"),
+}
+
+
+# ================= Trendline =================
+def add_ols_trendline(fig, data, x_col, y_col):
+    """Add the least-squares line ``trendline="ols"`` would draw, without statsmodels.
+
+    Plotly's built-in OLS trendline imports statsmodels (seconds of import
+    time and a large resident footprint) just to fit a straight line, so the
+    fit is done with NumPy and added as the same kind of trace.
+    """
+    temp = data[[x_col, y_col]].dropna().sort_values(x_col)
+    x = temp[x_col].to_numpy(dtype=float)
+    y = temp[y_col].to_numpy(dtype=float)
+
+    if len(x) < 2 or np.ptp(x) == 0:
+        return fig
+
+    slope, intercept = np.polyfit(x, y, 1)
+    fitted = slope * x + intercept
+
+    ss_tot = ((y - y.mean()) ** 2).sum()
+    r2 = 1 - ((y - fitted) ** 2).sum() / ss_tot if ss_tot else 1.0
+
+    fig.add_trace(go.Scatter(
+        x=x,
+        y=fitted,
+        mode="lines",
+        showlegend=False,
+        marker={"color": fig.data[0].marker.color if fig.data else None},
+        hovertemplate=(
+            f"<b>OLS trendline</b><br>{y_col} = {slope:g} * {x_col} + {intercept:g}"
+            f"<br>R<sup>2</sup>={r2:f}<br><br>{x_col}=%{{x}}<br>{y_col}=%{{y}} <b>(trend)</b><extra></extra>"
+        ),
+    ))
+
+    return fig
+
+
+# ================= Univariate =================
+def univariate_numeric(df, col):
+    fig1 = px.histogram(
+        df,
+        x=col,
+        nbins=30,
+        title="Distribution"
+    )
+
+    fig2 = px.box(
+        df,
+        y=col,
+        title="Outliers"
+    )
+
+    return fig1, fig2
+
+
+def category_counts(df, col):
+    counts = df[col].value_counts()
+    counts = counts[counts > 0].reset_index()
+    counts.columns = [col, "Count"]
+    return counts
+
+
+def univariate_categorical(counts, col):
+    if col in PIE_COLS:
+
+        fig = px.pie(
+            counts,
+            names=col,
+            values="Count",
+            hole=0.4,
+            title="Category Distribution"
+        )
+
+        fig.update_traces(textinfo="percent+label")
+
+    else:
+
+        fig = px.bar(
+            counts,
+            x=col,
+            y="Count",
+            text="Count",
+            title="Category Frequency"
+        )
+
+        fig.update_traces(textposition="outside")
+
+    return fig
+
+
+def heavy_hitters_bar(ranked, col, by, color=None):
+    """Bars of the ranked rows of a ``HeavyHitters.top`` frame (without its last, ``OTHER`` row)."""
+    data = ranked.copy()
+    data[col] = data[col].astype(str)
+
+    fig = px.bar(
+        data,
+        x=col,
+        y=by,
+        color=color,
+        text_auto=".3s",
+        title=f"Top {len(data)} {col} by {by}"
+    )
+
+    fig.update_xaxes(type="category")
+
+    return fig
+
+
+# ================= Bivariate =================
+def numeric_scatter(temp, x_col, y_col, chart_type):
+    if chart_type == "Correlation Scatter":
+
+        fig = px.scatter(
+            temp,
+            x=x_col,
+            y=y_col,
+            opacity=0.7
+        )
+
+        add_ols_trendline(fig, temp, x_col, y_col)
+
+    elif chart_type == "Regression Line":
+
+        fig = px.scatter(
+            temp,
+            x=x_col,
+            y=y_col
+        )
+
+        add_ols_trendline(fig, temp, x_col, y_col)
+
+    elif chart_type == "Distribution View":
+
+        fig = px.scatter(
+            temp,
+            x=x_col,
+            y=y_col,
+            marginal_x="histogram",
+            marginal_y="box"
+        )
+
+    else:  # Density
+
+        fig = px.density_heatmap(
+            temp,
+            x=x_col,
+            y=y_col
+        )
+
+    fig.update_layout(height=550)
+
+    return fig
+
+
+def correlation_heatmap(matrix):
+    fig = px.imshow(
+        matrix,
+        text_auto=".2f",
+        zmin=-1,
+        zmax=1,
+        color_continuous_scale="RdBu_r",
+        aspect="auto",
+        title="Correlation Matrix (full data)"
+    )
+
+    fig.update_layout(height=550)
+
+    return fig
+
+
+def category_aggregate(df, cat, metric, agg, engine=None):
+    """Aggregate ``metric`` by ``cat``; uses the encoded ``engine`` when one is given."""
+    if engine is not None:
+        temp = engine.aggregate(cat, metric, agg.lower())
+
+    elif agg == "Sum":
+        temp = df.groupby(cat, observed=True)[metric].sum()
+
+    elif agg == "Median":
+        temp = df.groupby(cat, observed=True)[metric].median()
+
+    else:
+        temp = df.groupby(cat, observed=True)[metric].mean()
+
+    temp = temp.round(2).reset_index()
+    temp = temp.sort_values(metric, ascending=False)
+
+    return temp
+
+
+def category_bar(temp, cat, metric, agg):
+    fig = px.bar(
+        temp,
+        x=cat,
+        y=metric,
+        text=metric,
+        title=f"{agg} {metric} by {cat}"
+    )
+
+    fig.update_traces(textposition="outside")
+    fig.update_layout(height=550)
+
+    return fig
+
+
+def time_aggregate(df, date_col, metric, agg, grain="Month"):
+    """``metric`` per period of ``grain``; the period column comes first."""
+    period, freq = TIME_GRAINS[grain]
+
+    temp = df[[date_col, metric]].copy()
+
+    temp[date_col] = pd.to_datetime(
+        temp[date_col],
+        errors="coerce"
+    )
+
+    temp = temp.dropna(subset=[date_col])
+
+    if grain == "Month":
+        temp[period] = temp[date_col].dt.to_period(freq).astype(str)
+    else:
+        temp[period] = temp[date_col].dt.floor(freq)
+
+    if agg == "Sum":
+        temp = temp.groupby(period, as_index=False)[metric].sum()
+
+    else:
+        temp = temp.groupby(period, as_index=False)[metric].mean()
+
+    temp[metric] = temp[metric].round(2)
+
+    return temp
+
+
+def period_label(value, grain):
+    if grain == "Day":
+        return f"{value:%Y-%m-%d}"
+    if grain == "Hour":
+        return f"{value:%Y-%m-%d %H:00}"
+    return str(value)
+
+
+def time_line(temp, metric, agg, points=POINT_BUDGET):
+    """Line of ``time_aggregate``'s output, LTTB-downsampled to at most ``points`` points."""
+    period = temp.columns[0]
+
+    fig = px.line(
+        downsample(temp, period, metric, points),
+        x=period,
+        y=metric,
+        markers=len(temp) <= 100,
+        title=f"{agg} {metric} Over Time"
+    )
+
+    fig.update_layout(height=550)
+
+    return fig
+
+
+# ================= Insights =================
+def insight_aggregates(df):
+    """Every groupby table behind the Insights questions, keyed by chart id.
+
+    From ``PARALLEL_ROWS`` rows on, the tables come from the partitioned
+    aggregation engine instead of pandas.
+    """
+    if len(df) >= PARALLEL_ROWS:
+        engine = aggregation_engine(_insight_columns(df), _insight_dimensions(), INSIGHT_MEASURES)
+        return _finish_insight_aggregates({
+            chart_id: engine.aggregate(dim, measure, how).dropna().reset_index()
+            for chart_id, (dim, measure, how) in INSIGHT_DIMENSIONS.items()
+        })
+
+    temp = df.dropna(subset=["invoicedate"]).copy()
+    temp["Month"] = temp["invoicedate"].dt.month
+    temp["Month_Name"] = temp["invoicedate"].dt.strftime("%b")
+
+    monthly = temp.groupby(["Month", "Month_Name"], observed=True)["Net_Revenue"].sum().reset_index()
+
+    return {
+        "q1_discount_by_return":
+            df.groupby(df["IsReturned"].astype(int))["discount"].mean().round(4).reset_index(),
+        "q2_revenue_by_category":
+            df.groupby("category", observed=True)["Net_Revenue"].sum().sort_values(ascending=False).reset_index(),
+        "q3_return_rate_by_country":
+            df.groupby("country", observed=True)["IsReturned"].mean().sort_values(ascending=False).reset_index(),
+        "q4_revenue_by_channel":
+            df.groupby("saleschannel", observed=True)["Net_Revenue"].sum().reset_index(),
+        "q6_revenue_by_customer_type":
+            df.groupby("Customer_Type", observed=True)["Net_Revenue"].sum().reset_index(),
+        "q7_monthly_revenue":
+            monthly.sort_values("Month"),
+        "q8_revenue_by_payment":
+            df.groupby("paymentmethod", observed=True)["Net_Revenue"].sum().sort_values(ascending=False).reset_index(),
+        "q9_return_rate_by_category":
+            df.groupby("category", observed=True)["IsReturned"].mean().sort_values(ascending=False).reset_index(),
+    }
+
+
+# Click-to-filter: the dimension each Insights chart filters on, and how its
+# table is aggregated from the cross-filter cube (measure, aggregation).
+INSIGHT_DIMENSIONS = {
+    "q1_discount_by_return": ("IsReturned", "discount", "mean"),
+    "q2_revenue_by_category": ("category", "Net_Revenue", "sum"),
+    "q3_return_rate_by_country": ("country", "IsReturned", "mean"),
+    "q4_revenue_by_channel": ("saleschannel", "Net_Revenue", "sum"),
+    "q6_revenue_by_customer_type": ("Customer_Type", "Net_Revenue", "sum"),
+    "q7_monthly_revenue": ("Month", "Net_Revenue", "sum"),
+    "q8_revenue_by_payment": ("paymentmethod", "Net_Revenue", "sum"),
+    "q9_return_rate_by_category": ("category", "IsReturned", "mean"),
+}
+
+
+INSIGHT_MEASURES = ["Net_Revenue", "IsReturned", "discount"]
+
+
+def _insight_dimensions():
+    return list(dict.fromkeys(dim for dim, _, _ in INSIGHT_DIMENSIONS.values()))
+
+
+def _insight_columns(df):
+    """The Insights dimensions and measures, with ``IsReturned`` as 0/1 and the ``Month`` number."""
+    temp = df[["category", "country", "saleschannel", "Customer_Type", "paymentmethod",
+               "IsReturned", "Net_Revenue", "discount"]].copy()
+    temp["IsReturned"] = temp["IsReturned"].astype(int)
+    temp["Month"] = df["invoicedate"].dt.month
+    return temp
+
+
+def insight_crossfilter(df):
+    """Cross-filter engine over the Insights dimensions."""
+    return CrossFilter(_insight_columns(df), _insight_dimensions(), INSIGHT_MEASURES)
+
+
+def selected_values(chart_id, points):
+    """Filter values clicked on an Insights chart (bar/line ``x``, pie ``label``)."""
+    values = [p.get("x", p.get("label")) for p in points]
+
+    if chart_id == "q7_monthly_revenue":
+        months = {name: number for number, name in enumerate(calendar.month_abbr)}
+        values = [months[v] for v in values if v in months]
+
+    return values
+
+
+def filtered_insight_aggregates(xf, filters):
+    """Same tables as ``insight_aggregates``, under the cross-filter selections."""
+    return _finish_insight_aggregates({
+        chart_id: xf.group(dim, measure, how, filters)
+        for chart_id, (dim, measure, how) in INSIGHT_DIMENSIONS.items()
+    })
+
+
+def _finish_insight_aggregates(data):
+    """Round, order and label raw per-dimension tables like ``insight_aggregates``."""
+    data["q1_discount_by_return"] = data["q1_discount_by_return"].round(4)
+
+    for chart_id, col in [
+        ("q2_revenue_by_category", "Net_Revenue"),
+        ("q3_return_rate_by_country", "IsReturned"),
+        ("q8_revenue_by_payment", "Net_Revenue"),
+        ("q9_return_rate_by_category", "IsReturned"),
+    ]:
+        data[chart_id] = data[chart_id].sort_values(col, ascending=False).reset_index(drop=True)
+
+    monthly = data["q7_monthly_revenue"].copy()
+    monthly["Month"] = monthly["Month"].astype(int)
+    monthly.insert(1, "Month_Name", [calendar.month_abbr[m] for m in monthly["Month"]])
+    data["q7_monthly_revenue"] = monthly
+
+    return data
+
+
+def insight_statistics(df, aggregates):
+    """Scalar figures quoted in the Insights summary and answers."""
+    return {
+        "total_sales": df["Gross_Sales"].sum(),
+        "net_revenue": df["Net_Revenue"].sum(),
+        "return_rate": df["IsReturned"].mean(),
+        "top_category": aggregates["q2_revenue_by_category"].iloc[0]["category"],
+        "top_channel": aggregates["q4_revenue_by_channel"].set_index("saleschannel")["Net_Revenue"].idxmax(),
+        "shipping_revenue_corr": df["shippingcost"].corr(df["Net_Revenue"]),
+        "discount_profit_corr": df["discount"].corr(df["Profit"]),
+    }
+
+
+def discount_by_return(data):
+    return px.bar(
+        data,
+        x="IsReturned",
+        y="discount",
+        text_auto=True,
+        title="Average Discount by Return Status",
+        labels={"IsReturned": "0 = NotReturned   and  1 = Returned"},
+    )
+
+
+def revenue_by_category(data):
+    return px.bar(
+        data,
+        x="category",
+        y="Net_Revenue",
+        text_auto=True,
+        color="category",
+        title="Total Net Revenue by Category"
+    )
+
+
+def return_rate_by_country(data):
+    return px.bar(
+        data.head(10),
+        x="country",
+        y="IsReturned",
+        text_auto=".2%",
+        title="Top 10 Countries by Return Rate",
+        color='country'
+    )
+
+
+def revenue_by_channel(data):
+    return px.bar(
+        data,
+        x="saleschannel",
+        y="Net_Revenue",
+        text_auto=True,
+        color="saleschannel",
+        title="Revenue by Sales Channel"
+    )
+
+
+def shipping_vs_revenue(df):
+    fig = px.scatter(
+        df,
+        x="shippingcost",
+        y="Net_Revenue",
+        opacity=0.5,
+        title="Shipping Cost vs Net Revenue"
+    )
+
+    return add_ols_trendline(fig, df, "shippingcost", "Net_Revenue")
+
+
+def revenue_by_customer_type(data):
+    return px.pie(
+        data,
+        names="Customer_Type",
+        values="Net_Revenue",
+        title="Revenue Contribution by Customer Type"
+    )
+
+
+def monthly_revenue(data):
+    return px.line(
+        data,
+        x="Month_Name",
+        y="Net_Revenue",
+        markers=True,
+        title="Monthly Revenue Trend"
+    )
+
+
+def revenue_timeline(data, grain):
+    """Revenue over the whole date range at ``grain`` (``time_aggregate`` output)."""
+    fig = time_line(data, "Net_Revenue", "Sum")
+    fig.update_layout(title=f"Revenue by {grain}", height=450)
+    return fig
+
+
+def revenue_by_payment(data):
+    return px.bar(
+        data,
+        x="paymentmethod",
+        y="Net_Revenue",
+        text_auto=True,
+        title="Revenue by Payment Method",
+        color= "paymentmethod"
+    )
+
+
+def return_rate_by_category(data):
+    return px.bar(
+        data,
+        x="category",
+        y="IsReturned",
+        text_auto=".2%",
+        title="Return Rate by Category",
+        color = 'category'
+    )
+
+
+def discount_vs_profit(df):
+    fig = px.scatter(
+        df,
+        x="discount",
+        y="Profit",
+        opacity=0.5,
+        title="Discount vs Profit"
+    )
+
+    return add_ols_trendline(fig, df, "discount", "Profit")
+
+
+# Insights scatter views draw a stratified sample of at most this many rows.
+INSIGHT_SCATTER_SAMPLE = max(SAMPLE_SIZES)
+
+
+def insight_scatter_rows(df):
+    """Sorted row positions of the stratified sample the Insights scatter views draw."""
+    return StratifiedSample(df).sample(INSIGHT_SCATTER_SAMPLE)
+
+
+# Figure builder per Insights chart id. Scatter views take the rows of
+# ``insight_scatter_rows``, the others take their table from ``insight_aggregates``.
+INSIGHT_CHARTS = {
+    "q1_discount_by_return": discount_by_return,
+    "q2_revenue_by_category": revenue_by_category,
+    "q3_return_rate_by_country": return_rate_by_country,
+    "q4_revenue_by_channel": revenue_by_channel,
+    "q5_shipping_vs_revenue": shipping_vs_revenue,
+    "q6_revenue_by_customer_type": revenue_by_customer_type,
+    "q7_monthly_revenue": monthly_revenue,
+    "q8_revenue_by_payment": revenue_by_payment,
+    "q9_return_rate_by_category": return_rate_by_category,
+    "q10_discount_vs_profit": discount_vs_profit,
+}
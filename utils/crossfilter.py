@@ -0,0 +1,125 @@
+"""Click-to-filter engine for linked charts.
+
+Filter columns are dictionary-encoded once (integer codes + labels) and
+folded into a small aggregate cube: one cell per combination of filter
+values, holding the row count and the sum of every measure. A chart's
+aggregate under any set of selections is then a reduction over the cube,
+independent of the number of rows. Each chart ignores its own selection
+(standard cross-filter behaviour), and results are memoised on the
+selections that actually affect that chart, so a click only recomputes
+the charts it changes.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.groupby import encode
+
+
+class CrossFilter:
+    """Dictionary-encoded filter columns and their measure cube."""
+
+    MEMO_SIZE = 1024
+
+    def __init__(self, df, dimensions, measures, max_cells=5_000_000):
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+
+        self.codes = {}
+        self.labels = {}
+        for dim in self.dimensions:
+            self.codes[dim], self.labels[dim] = encode(df[dim])
+        self._positions = {dim: {v: i for i, v in enumerate(self.labels[dim])} for dim in self.dimensions}
+
+        shape = tuple(len(self.labels[dim]) for dim in self.dimensions)
+        if np.prod(shape, dtype=np.int64) > max_cells:
+            raise ValueError(f"cross-filter cube {shape} exceeds {max_cells:,} cells")
+        self.shape = shape
+
+        # Rows with a missing filter value (code -1) cannot be selected; keep them out of the cube.
+        valid = np.ones(len(df), dtype=bool)
+        for dim in self.dimensions:
+            valid &= self.codes[dim] >= 0
+
+        cell = np.ravel_multi_index([self.codes[dim][valid] for dim in self.dimensions], shape)
+        size = int(np.prod(shape))
+
+        self.cube = {"count": np.bincount(cell, minlength=size).reshape(shape).astype(float)}
+        self.present = {}
+        for measure in self.measures:
+            values = df[measure].to_numpy(dtype=float)[valid]
+            self.cube[measure] = np.bincount(cell, weights=np.nan_to_num(values), minlength=size).reshape(shape)
+            self.present[measure] = np.bincount(cell, weights=~np.isnan(values), minlength=size).reshape(shape)
+
+        self._memo = {}
+
+    # ================= Selections =================
+    def _selected(self, dim, values):
+        """Boolean vector over ``dim``'s labels for the selected ``values``."""
+        selected = np.zeros(len(self.labels[dim]), dtype=bool)
+        positions = self._positions[dim]
+        selected[[positions[v] for v in values if v in positions]] = True
+        return selected
+
+    def _relevant(self, filters, exclude=None):
+        return tuple(sorted(
+            (dim, tuple(sorted(values, key=str)))
+            for dim, values in filters.items()
+            if values and dim != exclude and dim in self._positions
+        ))
+
+    def row_mask(self, filters, rows=None):
+        """Boolean row mask for all selections (for row-level views such as scatters).
+
+        With ``rows`` (row positions, e.g. a sample) the mask covers only those rows.
+        """
+        n = len(next(iter(self.codes.values()))) if rows is None else len(rows)
+        mask = np.ones(n, dtype=bool)
+        for dim, values in self._relevant(filters):
+            codes = self.codes[dim] if rows is None else self.codes[dim][rows]
+            # A code of -1 (missing) indexes the extra trailing False.
+            selected = np.append(self._selected(dim, values), False)
+            mask &= selected[codes]
+        return mask
+
+    # ================= Aggregates =================
+    def group(self, dim, measure, how="sum", filters=None):
+        """``measure`` aggregated by ``dim`` under every selection except ``dim``'s own.
+
+        ``how`` is ``"sum"``, ``"mean"`` or ``"count"``. Returns a frame with
+        ``dim`` and ``measure`` columns in label order.
+        """
+        relevant = self._relevant(filters or {}, exclude=dim)
+        key = (dim, measure, how, relevant)
+
+        # The memo is shared by every session: read it once and return the local result,
+        # since another thread may clear it in between.
+        result = self._memo.get(key)
+
+        if result is None:
+            axis = self.dimensions.index(dim)
+
+            def reduce(cube):
+                for other, values in relevant:
+                    other_axis = self.dimensions.index(other)
+                    cube = np.compress(self._selected(other, values), cube, axis=other_axis)
+                return cube.sum(axis=tuple(a for a in range(cube.ndim) if a != axis))
+
+            counts = reduce(self.cube["count"])
+
+            if how == "count":
+                values = counts
+            elif how == "mean":
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    values = reduce(self.cube[measure]) / reduce(self.present[measure])
+            else:
+                values = reduce(self.cube[measure])
+
+            result = pd.DataFrame({dim: self.labels[dim], measure: values})
+            result = result[counts > 0].reset_index(drop=True)
+
+            if len(self._memo) >= self.MEMO_SIZE:
+                self._memo.clear()
+            self._memo[key] = result
+
+        return result
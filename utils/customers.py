@@ -0,0 +1,158 @@
+"""Per-customer aggregate table with incremental updates and cohort retention.
+
+``CustomerTable.from_transactions`` builds one row per customer in a single
+vectorised groupby; ``update`` folds a batch of new transactions in by
+touching only the customers that appear in the batch. Per-customer
+lookups, rankings and the cohort retention matrix are then answered from
+the table (and a compact customer/period activity index) instead of from
+the transactions.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.data import find_column
+
+
+# Activity keys pack (customer id, period ordinal) into one int64.
+_PERIOD_BITS = 24
+
+
+def _customer_ids(df):
+    return find_column(df, "CustomerID")
+
+
+def _aggregate(df):
+    """One row per customer for the transactions in ``df``."""
+    cust = _customer_ids(df)
+    temp = df[[cust, "invoicedate", "Net_Revenue", "IsReturned", "Customer_Type"]].dropna(subset=[cust, "invoicedate"])
+    temp = temp.assign(**{cust: temp[cust].astype("int64")})
+
+    table = temp.groupby(cust, sort=False).agg(
+        orders=("Net_Revenue", "size"),
+        revenue=("Net_Revenue", "sum"),
+        returns=("IsReturned", "sum"),
+        first_purchase=("invoicedate", "min"),
+        last_purchase=("invoicedate", "max"),
+        customer_type=("Customer_Type", "last"),
+    )
+    table.index.name = "CustomerID"
+
+    return table
+
+
+def _activity_keys(df, freq):
+    """Sorted unique (customer, period) keys for the transactions in ``df``."""
+    cust = _customer_ids(df)
+    temp = df[[cust, "invoicedate"]].dropna()
+    ids = temp[cust].to_numpy().astype("int64")
+    periods = temp["invoicedate"].dt.to_period(freq).array.asi8
+    return np.unique((ids << _PERIOD_BITS) | periods)
+
+
+class CustomerTable:
+    """Lifetime aggregates per customer, maintained incrementally."""
+
+    def __init__(self, table, activity, freq="M"):
+        self.table = table
+        self.activity = activity
+        self.freq = freq
+        self._retention = None
+
+    @classmethod
+    def from_transactions(cls, df, freq="M"):
+        return cls(_aggregate(df), _activity_keys(df, freq), freq)
+
+    def __len__(self):
+        return len(self.table)
+
+    # ================= Incremental updates =================
+    def update(self, df):
+        """Fold a batch of new transactions into the table in place."""
+        part = _aggregate(df)
+        table = self.table
+
+        known = part.index.isin(table.index)
+        seen, new = part[known], part[~known]
+
+        if len(seen):
+            idx = seen.index
+            table.loc[idx, "orders"] += seen["orders"]
+            table.loc[idx, "revenue"] += seen["revenue"]
+            table.loc[idx, "returns"] += seen["returns"]
+            table.loc[idx, "first_purchase"] = np.minimum(table.loc[idx, "first_purchase"], seen["first_purchase"])
+            table.loc[idx, "last_purchase"] = np.maximum(table.loc[idx, "last_purchase"], seen["last_purchase"])
+            table.loc[idx, "customer_type"] = seen["customer_type"]
+
+        if len(new):
+            table = pd.concat([table, new])
+
+        self.table = table
+        self.activity = np.union1d(self.activity, _activity_keys(df, self.freq))
+        self._retention = None
+
+        return self
+
+    # ================= Views =================
+    def _derive(self, table, as_of=None):
+        as_of = pd.Timestamp(as_of) if as_of is not None else self.table["last_purchase"].max()
+
+        return table.assign(
+            recency_days=(as_of - table["last_purchase"]).dt.days,
+            return_rate=table["returns"] / table["orders"],
+            avg_order=table["revenue"] / table["orders"],
+            cohort=table["first_purchase"].dt.to_period(self.freq).astype(str),
+        )
+
+    def view(self, as_of=None):
+        """The table with derived recency, return rate, average order and cohort columns."""
+        return self._derive(self.table, as_of)
+
+    def kpis(self, as_of=None):
+        """Headline scalars, computed from the stored columns without deriving the full view."""
+        table = self.table
+        as_of = pd.Timestamp(as_of) if as_of is not None else table["last_purchase"].max()
+
+        return {
+            "customers": len(table),
+            "avg_revenue": table["revenue"].mean(),
+            "repeat_share": (table["orders"] > 1).mean(),
+            "avg_recency_days": (as_of - table["last_purchase"]).dt.days.mean(),
+        }
+
+    def top(self, n=10, by="revenue"):
+        """The ``n`` largest customers by a stored measure (orders, revenue or returns)."""
+        return self._derive(self.table.nlargest(n, by))
+
+    def lookup(self, customer_id):
+        """One customer's derived row, or ``None`` when the customer is unknown."""
+        if customer_id not in self.table.index:
+            return None
+        return self._derive(self.table.loc[[customer_id]]).iloc[0]
+
+    def cohort_retention(self):
+        """Share of each first-purchase cohort active N periods later (rows: cohort, columns: N).
+
+        Computed once and kept until the next ``update``.
+        """
+        # Tables pickled before the memo existed have no attribute yet.
+        if getattr(self, "_retention", None) is not None:
+            return self._retention
+
+        ids = self.activity >> _PERIOD_BITS
+        periods = self.activity & ((1 << _PERIOD_BITS) - 1)
+
+        first = self.table["first_purchase"].dt.to_period(self.freq).array.asi8
+        cohort_of = pd.Series(first, index=self.table.index)
+        cohorts = cohort_of.reindex(ids).to_numpy()
+
+        counts = pd.DataFrame({"cohort": cohorts, "age": periods - cohorts}).value_counts()
+        matrix = counts.unstack(fill_value=0).sort_index()
+
+        matrix = matrix.div(matrix[0], axis=0)
+        matrix.index = pd.PeriodIndex.from_ordinals(matrix.index, freq=self.freq).astype(str)
+        matrix.index.name = "Cohort"
+        matrix.columns.name = "Periods Since First Purchase"
+
+        self._retention = matrix
+        return matrix
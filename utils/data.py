@@ -0,0 +1,217 @@
+"""Dataset loading and column discovery shared by the pages and scripts."""
+
+import hashlib
+import os
+
+import pandas as pd
+
+
+DATA_PATH = "cleaned_dataset.csv"
+RAW_DATA_PATH = "online_sales_dataset.csv"
+
+EXCLUDE_COLS = ["CustomerID", "InvoiceDate", "InvoiceNo"]
+
+# Compact in-memory frames; set DASHBOARD_COMPACT=0 to load the plain pandas dtypes.
+COMPACT = os.environ.get("DASHBOARD_COMPACT", "1") != "0"
+
+# 0/1 flag columns held as ``bool``.
+BOOL_COLS = ["IsReturned"]
+
+# Text columns with at most this share of distinct values become categoricals.
+CATEGORY_RATIO = 0.5
+
+# Columns with this many distinct values or more are too diverse to chart category by category.
+CATEGORY_LIMIT = 50
+
+# Id-like key columns analysed through their heavy hitters, whatever their dtype.
+KEY_COLS = ["description", "stockcode", "customerid"]
+
+
+# ================= Loaders =================
+def read_dataset(path=DATA_PATH, compact=COMPACT):
+    """Plain read used by the Univariate page."""
+    df = pd.read_csv(path)
+    return compact_frame(df) if compact else df
+
+
+def read_home(path=DATA_PATH, compact=COMPACT):
+    """Read the dataset with ``invoicedate`` parsed, as used by the Home page."""
+    df = pd.read_csv(path)
+    df["invoicedate"] = pd.to_datetime(df["invoicedate"])
+    return compact_frame(df) if compact else df
+
+
+def read_bivariate(path=DATA_PATH, compact=COMPACT):
+    """Read the dataset with duplicate columns dropped and numeric-like text converted."""
+    df = pd.read_csv(path)
+
+    # Fix duplicate columns
+    df = df.loc[:, ~df.columns.duplicated()]
+
+    # Convert numeric-like columns
+    for col in df.columns:
+        try:
+            df[col] = pd.to_numeric(df[col])
+        except:
+            pass
+
+    return compact_frame(df) if compact else df
+
+
+def read_insights(path=DATA_PATH, compact=COMPACT):
+    """Read the dataset with coerced measures, parsed dates and the Profit column."""
+    df = pd.read_csv(path)
+
+    num_cols = [
+        "quantity", "unitprice", "shippingcost",
+        "Gross_Sales", "Net_Revenue",
+        "Total_Order_Value", "Shipping_Ratio",
+        "discount"
+    ]
+
+    for col in num_cols:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    if "invoicedate" in df.columns:
+        df["invoicedate"] = pd.to_datetime(df["invoicedate"], errors="coerce")
+
+    df["Profit"] = df["Net_Revenue"] - df["shippingcost"]
+
+    return compact_frame(df) if compact else df
+
+
+def raw_statistics(df):
+    """Data-quality KPIs of the raw dataset shown on the Dataset Issues page."""
+    total_rows = df.shape[0]
+    total_cols = df.shape[1]
+    missing_total = df.isna().sum().sum()
+    duplicate_count = df.duplicated().sum()
+
+    return {
+        "total_rows": total_rows,
+        "total_cols": total_cols,
+        "missing_percent": (missing_total / (total_rows * total_cols)) * 100,
+        "duplicate_percent": (duplicate_count / total_rows) * 100,
+    }
+
+
+# ================= Compact Mode =================
+def compact_frame(df):
+    """Return ``df`` with compact dtypes.
+
+    Integers are downcast to the narrowest type, floats become ``float32``
+    only where every value survives the round trip exactly (money columns
+    stay ``float64``, so totals do not move), repeated strings become
+    categoricals, date text becomes ``datetime64`` and ``BOOL_COLS`` become
+    ``bool``.
+    """
+    columns = {}
+
+    for col in df.columns:
+        s = df[col]
+
+        if col in BOOL_COLS and s.notna().all() and s.isin([0, 1]).all():
+            s = s.astype(bool)
+
+        elif pd.api.types.is_integer_dtype(s) and not pd.api.types.is_bool_dtype(s):
+            s = pd.to_numeric(s, downcast="integer")
+
+        elif pd.api.types.is_float_dtype(s):
+            narrow = s.astype("float32")
+            if ((narrow.astype("float64") == s) | s.isna()).all():
+                s = narrow
+
+        elif s.dtype == object:
+            if col in date_columns(df):
+                parsed = pd.to_datetime(s, errors="coerce")
+                if parsed.notna().sum() == s.notna().sum():
+                    columns[col] = parsed
+                    continue
+
+            if s.nunique() <= CATEGORY_RATIO * len(s):
+                s = s.astype("category")
+
+        columns[col] = s
+
+    return pd.DataFrame(columns, index=df.index)
+
+
+def memory_report(df, compact_df=None):
+    """Per-column deep memory use (MB) of ``df`` and of its compact form."""
+    if compact_df is None:
+        compact_df = compact_frame(df)
+
+    before = df.memory_usage(deep=True, index=False)
+    after = compact_df.memory_usage(deep=True, index=False)
+
+    report = pd.DataFrame({
+        "Column": df.columns,
+        "Dtype": df.dtypes.astype(str).to_numpy(),
+        "Compact Dtype": compact_df.dtypes.astype(str).to_numpy(),
+        "MB": before.to_numpy() / 2**20,
+        "Compact MB": after.to_numpy() / 2**20,
+    })
+    report["Saving ×"] = report["MB"] / report["Compact MB"]
+
+    return report.sort_values("MB", ascending=False).reset_index(drop=True)
+
+
+# ================= Column Types =================
+def numeric_columns(df):
+    return df.select_dtypes(include=["number", "bool"]).columns.tolist()
+
+
+def categorical_columns(df, exclude=()):
+    return [
+        c for c in df.select_dtypes(include=["object", "category"]).columns
+        if c not in exclude and df[c].nunique() < CATEGORY_LIMIT
+    ]
+
+
+def high_cardinality_columns(df):
+    """``KEY_COLS`` plus any other text column with ``CATEGORY_LIMIT`` or more distinct values."""
+    dates = date_columns(df)
+    text = df.select_dtypes(include=["object", "category"]).columns
+
+    return [
+        c for c in df.columns
+        if c.lower() in KEY_COLS
+        or (c in text and c not in dates and df[c].nunique() >= CATEGORY_LIMIT)
+    ]
+
+
+def find_column(df, name):
+    """Return the column matching ``name`` case-insensitively (``CustomerID`` / ``customerid``)."""
+    for col in df.columns:
+        if col.lower() == name.lower():
+            return col
+    raise KeyError(name)
+
+
+def date_columns(df):
+    return [
+        c for c in df.columns
+        if "date" in c.lower() or "time" in c.lower()
+    ]
+
+
+# ================= Versioning =================
+def dataset_version(path=DATA_PATH, use_hash=False):
+    """Identify the current contents of ``path``.
+
+    The default is cheap (modification time and size); ``use_hash`` reads the
+    whole file and returns its SHA-256 instead. Missing files map to ``"missing"``.
+    """
+    if not os.path.exists(path):
+        return "missing"
+
+    if use_hash:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()[:16]
+
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
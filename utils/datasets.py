@@ -0,0 +1,84 @@
+"""Several store/region datasets per deployment, behind one bounded cache.
+
+The default dataset is the pair of CSVs in the working directory; every
+sub-directory of ``DATASETS_DIR`` holding a ``cleaned_dataset.csv`` (and
+optionally an ``online_sales_dataset.csv``) is another dataset. Frames and
+derived artifacts of every dataset share one process-wide LRU cache,
+bounded by ``DASHBOARD_CACHE_MB``, that evicts whole dataset versions.
+"""
+
+import os
+
+import streamlit as st
+
+from utils.data import DATA_PATH, RAW_DATA_PATH
+from utils.lru import LRUCache
+from utils.warmup import current_version, load_artifact
+
+
+DATASETS_DIR = "datasets"
+DEFAULT_DATASET = "default"
+
+CACHE_BUDGET = int(os.environ.get("DASHBOARD_CACHE_MB", "1024")) * 2**20
+
+# Keys are (dataset, version, artifact); one dataset version is one eviction group.
+CACHE = LRUCache(CACHE_BUDGET, group=lambda key: key[:2])
+
+
+# ================= Registry =================
+def list_datasets():
+    names = [DEFAULT_DATASET] if os.path.exists(DATA_PATH) else []
+
+    if os.path.isdir(DATASETS_DIR):
+        names += sorted(
+            d for d in os.listdir(DATASETS_DIR)
+            if os.path.exists(os.path.join(DATASETS_DIR, d, DATA_PATH))
+        )
+
+    return names or [DEFAULT_DATASET]
+
+
+def dataset_paths(dataset):
+    """``(cleaned, raw)`` CSV paths of ``dataset``."""
+    if dataset == DEFAULT_DATASET:
+        return DATA_PATH, RAW_DATA_PATH
+    root = os.path.join(DATASETS_DIR, dataset)
+    return os.path.join(root, DATA_PATH), os.path.join(root, RAW_DATA_PATH)
+
+
+def dataset_version(dataset):
+    """Version of ``dataset``'s files (changes whenever either CSV changes)."""
+    data_path, raw_path = dataset_paths(dataset)
+    return current_version(data_path=data_path, raw_path=raw_path)
+
+
+def cached(dataset, name, builder):
+    """Artifact ``name`` of ``dataset`` from the shared cache, built on a miss.
+
+    The default dataset is served from the warm snapshot when one matches.
+    """
+    version = dataset_version(dataset)
+
+    if dataset == DEFAULT_DATASET:
+        return CACHE.get_or_build((dataset, version, name), lambda: load_artifact(name, builder))
+    return CACHE.get_or_build((dataset, version, name), builder)
+
+
+# ================= Selector =================
+def select_dataset():
+    """Sidebar dataset picker shared by every page; hidden with a single dataset."""
+    names = list_datasets()
+    if len(names) == 1:
+        return names[0]
+
+    # Widget state is dropped on page switches, so the choice lives in its own key
+    # and is copied into the widget before it renders.
+    if st.session_state.get("dataset") not in names:
+        st.session_state["dataset"] = names[0]
+    st.session_state["dataset_widget"] = st.session_state["dataset"]
+
+    def remember():
+        st.session_state["dataset"] = st.session_state["dataset_widget"]
+
+    st.sidebar.selectbox("🗄️ Dataset", names, key="dataset_widget", on_change=remember)
+    return st.session_state["dataset"]
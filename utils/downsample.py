@@ -0,0 +1,70 @@
+"""Shape-preserving downsampling of long series for line charts.
+
+Largest-Triangle-Three-Buckets (LTTB, Steinarsson 2013): the series is cut
+into equal-count buckets and, walking left to right, each bucket keeps the
+point that forms the largest triangle with the point kept in the previous
+bucket and the average of the next bucket. Peaks, troughs and turns
+survive, so a daily or hourly trend over years can be drawn from a fixed
+``POINT_BUDGET`` of points whatever its length.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# About one point per horizontal pixel of a full-width chart.
+POINT_BUDGET = 1000
+
+
+def lttb(x, y, n_out):
+    """Sorted positions of the ``n_out`` points of ``(x, y)`` that LTTB keeps.
+
+    ``x`` must be sorted. Series that already fit are returned whole.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket i (of n_out - 2) is edges[i]:edges[i + 1]; the last point is its own bucket.
+    every = (n - 2) / (n_out - 2)
+    edges = np.append((np.arange(n_out - 1) * every).astype(np.intp) + 1, n)
+
+    sizes = np.diff(edges)
+    avg_x = np.add.reduceat(x, edges[:-1]) / sizes
+    avg_y = np.add.reduceat(y, edges[:-1]) / sizes
+
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        cx, cy = avg_x[i + 1], avg_y[i + 1]
+
+        area = np.abs((x[a] - cx) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (cy - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+
+    return keep
+
+
+def downsample(df, x_col, y_col, n_out=POINT_BUDGET):
+    """Rows of ``df`` (sorted by ``x_col``) that LTTB keeps for a line of ``y_col``.
+
+    Dates are placed by time, numbers by value and anything else by position.
+    """
+    temp = df.dropna(subset=[y_col])
+
+    if len(temp) <= n_out:
+        return temp
+
+    x = temp[x_col]
+    if pd.api.types.is_datetime64_any_dtype(x):
+        x = x.astype("int64")
+    elif not pd.api.types.is_numeric_dtype(x):
+        x = np.arange(len(temp))
+
+    return temp.iloc[lttb(x, temp[y_col], n_out)]
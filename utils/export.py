@@ -0,0 +1,118 @@
+"""Streamed export of the Home page's filtered rows to CSV or Parquet.
+
+The source CSV is read in chunks with only the requested (and filter)
+columns; each chunk is filtered and appended to the output file, so memory
+stays bounded by the chunk size whatever the number of matching rows.
+Exports are written under ``EXPORT_DIR`` (``static/`` is served by
+Streamlit's static file serving) and renamed into place once complete.
+"""
+
+import os
+import time
+import uuid
+
+import pandas as pd
+
+
+EXPORT_DIR = os.path.join("static", "exports")
+
+CHUNK_ROWS = 50_000
+
+# Exports older than this (seconds) are deleted when a new one is written.
+MAX_AGE = 3600
+
+FORMATS = {"CSV": "csv", "Parquet": "parquet"}
+
+
+def filtered_chunks(path, start, end, country="All", category="All", columns=None, chunksize=CHUNK_ROWS):
+    """Yield the rows of ``path`` matching a Home filter state (inclusive dates), chunk by chunk."""
+    header = pd.read_csv(path, nrows=0).columns.tolist()
+    columns = columns or header
+    needed = [c for c in header if c in columns or c in ("invoicedate", "country", "category")]
+
+    for chunk in pd.read_csv(path, usecols=needed, chunksize=chunksize):
+        chunk["invoicedate"] = pd.to_datetime(chunk["invoicedate"], errors="coerce")
+        mask = (chunk["invoicedate"] >= start) & (chunk["invoicedate"] < end + pd.Timedelta(days=1))
+
+        if country != "All":
+            mask &= chunk["country"] == country
+
+        if category != "All":
+            mask &= chunk["category"] == category
+
+        yield chunk.loc[mask, columns]
+
+
+def write_export(chunks, out, fmt="csv", progress=None):
+    """Append ``chunks`` to ``out`` as CSV or Parquet; returns the number of rows written.
+
+    ``progress(rows)`` is called after every chunk. The file only appears
+    under its final name once it is complete.
+    """
+    tmp = f"{out}.part"
+    rows = 0
+
+    if fmt == "csv":
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            for i, part in enumerate(chunks):
+                part.to_csv(f, header=i == 0, index=False)
+                rows += len(part)
+                if progress:
+                    progress(rows)
+
+    else:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        empty = None
+        try:
+            for part in chunks:
+                table = pa.Table.from_pandas(part, preserve_index=False)
+                if writer is None:
+                    # An empty (or all-missing) column has no type to infer yet.
+                    if not len(part):
+                        empty = table
+                        continue
+                    schema = pa.schema([
+                        f.with_type(pa.string()) if pa.types.is_null(f.type) else f for f in table.schema
+                    ])
+                    writer = pq.ParquetWriter(tmp, schema)
+                    table = table.cast(schema)
+                else:
+                    # Chunk-wise type inference can differ (e.g. int vs. float with NaN).
+                    table = table.cast(writer.schema)
+                writer.write_table(table)
+                rows += len(part)
+                if progress:
+                    progress(rows)
+            if writer is None and empty is not None:
+                # Nothing matched: still write an (empty) file with the requested columns.
+                writer = pq.ParquetWriter(tmp, empty.schema)
+                writer.write_table(empty)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    os.replace(tmp, out)
+    return rows
+
+
+def new_export_path(fmt, root=EXPORT_DIR):
+    os.makedirs(root, exist_ok=True)
+    return os.path.join(root, f"filtered-{uuid.uuid4().hex[:12]}.{fmt}")
+
+
+def prune_exports(root=EXPORT_DIR, max_age=MAX_AGE):
+    if not os.path.isdir(root):
+        return
+
+    now = time.time()
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        # Another session may prune, or finish writing, the same file meanwhile.
+        try:
+            if now - os.path.getmtime(path) > max_age:
+                os.remove(path)
+        except FileNotFoundError:
+            continue
@@ -0,0 +1,59 @@
+"""Process-wide cache of serialised Plotly figures, keyed by chart inputs.
+
+Building a Plotly Express figure (trace generation, templating and
+validation) costs tens of milliseconds, and every rerun used to rebuild
+every chart on the page. A built figure is stored as its JSON under
+(dataset, version, chart id, parameters) and later reruns, in any session,
+restore it without re-validating it: it was validated when it was built.
+The cache is bounded by ``DASHBOARD_FIGURES_MB`` and evicts whole dataset
+versions, least recently used first, then single figures of the current
+version (the Insights cross-filters alone give unboundedly many keys).
+"""
+
+import json
+import os
+
+import plotly.graph_objects as go
+
+from utils.datasets import dataset_version
+from utils.lru import LRUCache
+
+
+def _spec_size(spec):
+    return len(spec) if isinstance(spec, str) else sum(map(len, spec))
+
+
+# Keys are (dataset, version, chart id, params); one dataset version is one eviction group.
+FIGURE_CACHE = LRUCache(
+    max_bytes=int(os.environ.get("DASHBOARD_FIGURES_MB", "128")) * 2**20,
+    max_items=4096,
+    group=lambda key: key[:2],
+    sizeof=_spec_size,
+    evict_entries=True
+)
+
+
+def _restore(spec):
+    # The JSON came from a validated figure, so skip Plotly's per-property validation.
+    return go.Figure(json.loads(spec), _validate=False)
+
+
+def cached_figure(dataset, chart_id, params, build):
+    """``build()``'s figure (or tuple of figures) from the cache, built on a miss.
+
+    ``params`` must hold every input besides the dataset that changes the
+    chart, as hashable values.
+    """
+    key = (dataset, dataset_version(dataset), chart_id, params)
+
+    def serialise():
+        figures = build()
+        if isinstance(figures, go.Figure):
+            return figures.to_json()
+        return tuple(fig.to_json() for fig in figures)
+
+    spec = FIGURE_CACHE.get_or_build(key, serialise)
+
+    if isinstance(spec, str):
+        return _restore(spec)
+    return tuple(_restore(s) for s in spec)
@@ -0,0 +1,100 @@
+"""Category-by-numeric aggregation on dictionary-encoded columns.
+
+Every categorical column is factorised once into small integer codes and
+every numeric column is held as a float array; all categorical/numeric
+pairs share these arrays. Sum, count and mean are single ``np.bincount``
+passes over the codes. Medians use a per-metric value ordering (computed
+once) followed by a stable sort of the small integer codes, which NumPy
+does with a linear-time radix sort, so each group ends up as a sorted
+contiguous segment.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def encode(values):
+    """Factorise ``values`` into the narrowest signed integer codes and sorted labels.
+
+    Missing values get code ``-1``, as with ``pd.factorize``.
+    """
+    codes, labels = pd.factorize(values, sort=True)
+    if isinstance(labels, pd.CategoricalIndex):
+        labels = labels.astype(labels.categories.dtype)
+    dtype = np.promote_types(np.min_scalar_type(-len(labels)), np.int8)
+    return codes.astype(dtype), labels
+
+
+class EncodedFrame:
+    """Encoded categorical codes and numeric arrays of one dataset."""
+
+    def __init__(self, df, cat_cols, num_cols):
+        self.codes = {}
+        self.labels = {}
+        for col in cat_cols:
+            self.codes[col], self.labels[col] = encode(df[col])
+
+        self.values = {col: df[col].to_numpy(dtype=float) for col in num_cols}
+
+        self._value_order = {}
+
+    def _valid(self, cat, metric):
+        """Row mask (or ``None`` when every row counts) of known category and non-null value."""
+        codes, values = self.codes[cat], self.values[metric]
+        mask = None
+        if (codes < 0).any():
+            mask = codes >= 0
+        if np.isnan(values).any():
+            mask = ~np.isnan(values) if mask is None else mask & ~np.isnan(values)
+        return mask
+
+    def _median(self, cat, metric, mask, counts):
+        if metric not in self._value_order:
+            self._value_order[metric] = np.argsort(self.values[metric], kind="stable")
+        order = self._value_order[metric]
+
+        codes = self.codes[cat][order]
+        values = self.values[metric][order]
+        if mask is not None:
+            keep = mask[order]
+            codes, values = codes[keep], values[keep]
+
+        # Stable radix sort on the codes keeps each group's values in sorted order.
+        values = values[np.argsort(codes, kind="stable")]
+
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        lower = starts + (counts - 1) // 2
+        upper = starts + counts // 2
+
+        medians = np.full(len(counts), np.nan)
+        present = counts > 0
+        medians[present] = (values[lower[present]] + values[upper[present]]) / 2
+
+        return medians
+
+    def aggregate(self, cat, metric, how="sum"):
+        """``metric`` by ``cat`` as a Series like ``df.groupby(cat)[metric].<how>()``.
+
+        ``how`` is ``"sum"``, ``"count"``, ``"mean"`` or ``"median"``.
+        """
+        codes, values = self.codes[cat], self.values[metric]
+        k = len(self.labels[cat])
+
+        mask = self._valid(cat, metric)
+        group_codes = codes if mask is None else codes[mask]
+        group_values = values if mask is None else values[mask]
+
+        counts = np.bincount(group_codes, minlength=k)
+
+        if how == "count":
+            result = counts
+        elif how == "median":
+            result = self._median(cat, metric, mask, counts)
+        else:
+            sums = np.bincount(group_codes, weights=group_values, minlength=k)
+            if how == "mean":
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    sums = sums / counts
+            result = sums
+
+        return pd.Series(result, index=pd.Index(self.labels[cat], name=cat), name=metric)
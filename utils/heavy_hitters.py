@@ -0,0 +1,172 @@
+"""Top-K heavy hitters of high-cardinality columns in bounded memory.
+
+Space-Saving (Metwally et al.) keeps ``CAPACITY`` counters per column and
+measure instead of one per distinct key. Rows are folded in chunk by
+chunk. Each chunk is first totalled per key, then merged into the
+counters as in the parallel Space-Saving merge (Cafaro et al.). A key that
+is already counted adds its chunk total. A new key starts from the
+smallest counter when every counter is in use, and that starting value is
+its error bound. Then the ``CAPACITY`` largest counters are kept.
+
+Every estimate overcounts its key by at most its error, and at most
+``total / CAPACITY``. Weights (e.g. ``Net_Revenue``) must be non-negative,
+so negative values count as zero.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+CAPACITY = 5000
+
+CHUNK_ROWS = 100_000
+
+# Ranking measures: row counts, or sums of a column.
+COUNT = "Count"
+MEASURES = [COUNT, "Net_Revenue"]
+
+# Label of the bucket of every uncounted value. ``top`` always puts it in the
+# last row, which is how it is told apart from a real value.
+OTHER = "(all other values)"
+
+
+class SpaceSaving:
+    """Space-Saving counters of one key column, counting rows or summing a weight."""
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=float)
+        self.errors = pd.Series(dtype=float)
+        self.total = 0.0
+
+    def update(self, keys, weights=None):
+        """Fold in a batch of ``keys`` (a Series) with optional per-row ``weights``."""
+        codes, uniques = pd.factorize(keys)
+        return self.merge(*_totals(codes, uniques, weights))
+
+    def merge(self, batch, total):
+        """Fold in a batch's exact per-key totals; ``total`` also covers its rows without a key."""
+        self.total += float(total)
+
+        if batch.empty:
+            return self
+
+        floor = self.max_error
+        values = batch.to_numpy()
+
+        # Hash lookups rather than index alignment, which sorts the keys.
+        pos = self.counts.index.get_indexer(batch.index)
+        known = pos >= 0
+
+        counts = self.counts.to_numpy().copy()
+        counts[pos[known]] += values[known]
+
+        index = self.counts.index.append(batch.index[~known])
+        counts = np.concatenate([counts, floor + values[~known]])
+        errors = np.concatenate([self.errors.to_numpy(), np.full((~known).sum(), floor)])
+
+        if len(counts) > self.capacity:
+            keep = np.argpartition(-counts, self.capacity - 1)[:self.capacity]
+            index, counts, errors = index[keep], counts[keep], errors[keep]
+
+        self.counts = pd.Series(counts, index=index)
+        self.errors = pd.Series(errors, index=index)
+
+        return self
+
+    @property
+    def max_error(self):
+        """Largest possible overcount of any key (0 while every key still has a counter)."""
+        return self.counts.min() if len(self.counts) >= self.capacity else 0.0
+
+    def top(self, k):
+        """The ``k`` largest estimates with their error bounds, largest first."""
+        top = self.counts.nlargest(k)
+        return pd.DataFrame({"Estimate": top, "Error": self.errors[top.index]})
+
+
+def _totals(codes, uniques, weights=None):
+    """Per-key totals and grand total of one batch; negative and missing weights count as zero.
+
+    Rows without a key only count towards the grand total, so they end up in ``OTHER``.
+    """
+    if weights is None:
+        weights = np.ones(len(codes))
+    else:
+        weights = pd.to_numeric(weights, errors="coerce").fillna(0).clip(lower=0).to_numpy(dtype=float)
+
+    valid = codes >= 0
+    sums = np.bincount(codes[valid], weights=weights[valid], minlength=len(uniques))
+    return pd.Series(sums, index=pd.Index(np.asarray(uniques, dtype=object))), weights.sum()
+
+
+class HeavyHitters:
+    """``SpaceSaving`` counters of several key columns, by row count and by each summed measure."""
+
+    def __init__(self, columns, measures=MEASURES, capacity=CAPACITY):
+        self.columns = list(columns)
+        self.measures = list(measures)
+        self.rows = 0
+        self.sketches = {(col, by): SpaceSaving(capacity) for col in self.columns for by in self.measures}
+
+    @classmethod
+    def from_frame(cls, df, columns, measures=MEASURES, capacity=CAPACITY, chunk_rows=CHUNK_ROWS):
+        measures = [m for m in measures if m == COUNT or m in df.columns]
+        hitters = cls(columns, measures, capacity)
+        for start in range(0, len(df), chunk_rows):
+            hitters.update(df.iloc[start:start + chunk_rows])
+        return hitters
+
+    def update(self, df):
+        """Fold appended rows into every counter."""
+        for col in self.columns:
+            keys = df[col]
+
+            # Whole-number float ids (``customerid`` read with NaNs) are shown as integers.
+            if pd.api.types.is_float_dtype(keys) and (keys.dropna() % 1 == 0).all():
+                keys = keys.astype("Int64")
+
+            # One factorisation per column serves every measure.
+            codes, uniques = pd.factorize(keys)
+
+            for by in self.measures:
+                self.sketches[col, by].merge(*_totals(codes, uniques, None if by == COUNT else df[by]))
+
+        self.rows += len(df)
+        return self
+
+    def top(self, col, by=COUNT, k=10):
+        """Top ``k`` values of ``col`` by ``by`` plus a last ``OTHER`` row for the rest.
+
+        ``Error`` is the most an estimate can overcount; ``Share`` is of the column total.
+        """
+        sketch = self.sketches[col, by]
+        top = sketch.top(k)
+
+        other = max(sketch.total - top["Estimate"].sum(), 0.0)
+
+        frame = pd.concat([
+            top,
+            pd.DataFrame({"Estimate": [other], "Error": [np.nan]}, index=[OTHER]),
+        ])
+        frame.index.name = col
+        frame["Share"] = frame["Estimate"] / sketch.total if sketch.total else np.nan
+
+        return frame.reset_index().rename(columns={"Estimate": by})
+
+    def top_items(self, col, by=COUNT, k=10):
+        """``top`` plus each item's estimate of the other measures (NaN where untracked)."""
+        top = self.top(col, by, k)
+        items = top[col].iloc[:-1]
+
+        for i, other in enumerate(m for m in self.measures if m != by):
+            top.insert(2 + i, other, list(self.estimate(col, other, items)) + [None])
+
+        return top
+
+    def estimate(self, col, by, values):
+        """Estimates of ``by`` for ``values`` of ``col``; NaN for values without a counter."""
+        return self.sketches[col, by].counts.reindex(values)
+
+    def max_error(self, col, by=COUNT):
+        return self.sketches[col, by].max_error
@@ -0,0 +1,126 @@
+"""Live mode: tail an append-only transactions CSV and keep running KPIs.
+
+``LiveFeed.poll`` reads whatever was appended since the previous poll, in
+micro-batches of at most ``batch_bytes`` of complete lines, and folds each
+batch into running ``MEASURES`` totals and a per-bucket revenue trend. A
+refresh therefore costs only the new rows. The file must start with the
+cleaned dataset's header; if it shrinks (truncated or replaced) the state
+is rebuilt from the start.
+"""
+
+import io
+import os
+import threading
+import time
+
+import pandas as pd
+
+from utils.prefix import MEASURES, kpis_from_totals
+
+
+LIVE_PATH = "live_transactions.csv"
+
+# Micro-batch size; must exceed the longest line.
+BATCH_BYTES = 1 << 20
+
+LIVE_COLUMNS = {"invoicedate", "category"} | {col for col, _ in MEASURES.values()}
+
+
+class LiveFeed:
+    """Running KPI and trend state of an append-only transactions file."""
+
+    def __init__(self, path=LIVE_PATH, bucket="1min", batch_bytes=BATCH_BYTES):
+        self.path = path
+        self.bucket = bucket
+        self.batch_bytes = batch_bytes
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.offset = 0
+        self.header = None
+        self.rows = 0
+        self.batches = 0
+        self.totals = dict.fromkeys(MEASURES, 0.0)
+        self.trend = {}
+        self.by_category = {}
+        self.last_poll = None
+
+    # ================= Ingestion =================
+    def _read(self):
+        """Complete lines appended after ``offset`` (at most ``batch_bytes``)."""
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < self.offset:
+                self.reset()
+            f.seek(self.offset)
+            chunk = f.read(self.batch_bytes)
+
+        # Leave a partially written last line for the next poll.
+        chunk = chunk[:chunk.rfind(b"\n") + 1]
+        self.offset += len(chunk)
+
+        if self.header is None and chunk:
+            end = chunk.index(b"\n") + 1
+            self.header, chunk = chunk[:end], chunk[end:]
+
+        return chunk
+
+    def _ingest(self, chunk):
+        batch = pd.read_csv(io.BytesIO(self.header + chunk), usecols=lambda c: c in LIVE_COLUMNS)
+        batch["invoicedate"] = pd.to_datetime(batch["invoicedate"], errors="coerce")
+
+        for name, (col, how) in MEASURES.items():
+            values = batch[col] if col == "invoicedate" else pd.to_numeric(batch[col], errors="coerce")
+            self.totals[name] += values.count() if how == "count" else values.sum()
+
+        net = pd.to_numeric(batch["Net_Revenue"], errors="coerce")
+
+        for key, value in net.groupby(batch["invoicedate"].dt.floor(self.bucket)).sum().items():
+            self.trend[key] = self.trend.get(key, 0.0) + value
+
+        for key, value in net.groupby(batch["category"]).sum().items():
+            self.by_category[key] = self.by_category.get(key, 0.0) + value
+
+        self.rows += len(batch)
+        self.batches += 1
+
+    def poll(self):
+        """Ingest everything appended since the last poll; returns the number of new rows."""
+        if not os.path.exists(self.path):
+            return 0
+
+        with self._lock:
+            before = self.rows
+
+            while True:
+                chunk = self._read()
+                if not chunk:
+                    break
+                self._ingest(chunk)
+
+            self.last_poll = time.time()
+            return self.rows - before
+
+    # ================= Views =================
+    # The feed is shared by every session: views copy the state under the lock
+    # so that another session's poll cannot change it mid-read.
+    def kpis(self):
+        """The Home page KPIs over every live row so far."""
+        with self._lock:
+            totals = dict(self.totals)
+        return kpis_from_totals(totals)
+
+    def trend_frame(self, last=240):
+        """Net revenue of the latest ``last`` buckets."""
+        with self._lock:
+            trend = dict(self.trend)
+        trend = pd.Series(trend, name="Net_Revenue", dtype=float).sort_index().tail(last)
+        trend.index.name = "invoicedate"
+        return trend.reset_index()
+
+    def category_frame(self):
+        with self._lock:
+            by_category = dict(self.by_category)
+        revenue = pd.Series(by_category, name="Net_Revenue", dtype=float).sort_values(ascending=False)
+        revenue.index.name = "category"
+        return revenue.reset_index()
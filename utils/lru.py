@@ -0,0 +1,176 @@
+"""Thread-safe LRU cache bounded by total size, with hit/miss/eviction counters.
+
+Entries can be grouped (e.g. every artifact of one dataset version): using
+any entry refreshes its whole group, and under pressure the least recently
+used group is evicted as a whole. The group being written is never
+evicted, so a single oversized group still fits on its own, unless the
+cache is built with ``evict_entries``: then that group's least recently
+used entries go next, so the bounds always hold.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+_MISSING = object()
+
+
+def deep_size(obj, _seen=None):
+    """Approximate resident size in bytes of frames, arrays, containers and plain objects."""
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(deep_size(v, seen) for v in obj)
+    if hasattr(obj, "__dict__"):
+        return sys.getsizeof(obj) + deep_size(vars(obj), seen)
+    return sys.getsizeof(obj)
+
+
+class LRUCache:
+    """Least-recently-used cache bounded by ``max_bytes`` and/or ``max_items``.
+
+    ``group(key)`` maps keys to eviction groups (default: every key is its
+    own group). ``evictions`` counts evicted groups and, with
+    ``evict_entries``, entries evicted from the most recent group.
+    """
+
+    def __init__(self, max_bytes=None, max_items=None, group=None, sizeof=deep_size, evict_entries=False):
+        self.max_bytes = max_bytes
+        self.max_items = max_items
+        self.sizeof = sizeof
+        self.evict_entries = evict_entries
+        self._group = group or (lambda key: key)
+
+        self._groups = OrderedDict()
+        self._group_bytes = {}
+        self.nbytes = 0
+        self.items = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return self.items
+
+    def __contains__(self, key):
+        entries = self._groups.get(self._group(key))
+        return entries is not None and key in entries
+
+    # ================= Access =================
+    def get(self, key, default=None):
+        with self._lock:
+            group = self._group(key)
+            entries = self._groups.get(group)
+            if entries is not None and key in entries:
+                self._groups.move_to_end(group)
+                entries.move_to_end(key)
+                self.hits += 1
+                return entries[key][0]
+            self.misses += 1
+            return default
+
+    def put(self, key, value, size=None):
+        size = self.sizeof(value) if size is None else size
+
+        with self._lock:
+            group = self._group(key)
+            entries = self._groups.setdefault(group, OrderedDict())
+
+            if key in entries:
+                old = entries.pop(key)[1]
+                self._group_bytes[group] -= old
+                self.nbytes -= old
+                self.items -= 1
+
+            entries[key] = (value, size)
+            self._group_bytes[group] = self._group_bytes.get(group, 0) + size
+            self.nbytes += size
+            self.items += 1
+
+            self._groups.move_to_end(group)
+            self._evict()
+
+    def get_or_build(self, key, builder):
+        """Cached value of ``key``, or ``builder()`` stored on a miss.
+
+        The builder runs outside the lock, so concurrent misses may build twice.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = builder()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._groups.clear()
+            self._group_bytes.clear()
+            self.nbytes = 0
+            self.items = 0
+
+    # ================= Eviction =================
+    def _over(self):
+        return (
+            (self.max_bytes is not None and self.nbytes > self.max_bytes)
+            or (self.max_items is not None and self.items > self.max_items)
+        )
+
+    def _evict(self):
+        # The most recent group sits last and is never evicted.
+        while self._over() and len(self._groups) > 1:
+            group, entries = self._groups.popitem(last=False)
+            self.nbytes -= self._group_bytes.pop(group)
+            self.items -= len(entries)
+            self.evictions += 1
+
+        if not self.evict_entries or not self._groups:
+            return
+
+        # Only the most recent group is left: evict its least recently used entries,
+        # keeping the one just written.
+        group = next(reversed(self._groups))
+        entries = self._groups[group]
+        while self._over() and len(entries) > 1:
+            _, (_, size) = entries.popitem(last=False)
+            self._group_bytes[group] -= size
+            self.nbytes -= size
+            self.items -= 1
+            self.evictions += 1
+
+    # ================= Metrics =================
+    def groups(self):
+        """Resident groups from least to most recently used, with their sizes in bytes."""
+        with self._lock:
+            return [(group, self._group_bytes[group]) for group in self._groups]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else float("nan"),
+                "items": self.items,
+                "groups": len(self._groups),
+                "nbytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+            }
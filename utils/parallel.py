@@ -0,0 +1,225 @@
+"""Partitioned Category-by-Numeric aggregation across CPU cores.
+
+The encoded group codes and numeric columns are written once to ``.npy``
+files that worker processes memory-map. The OS page cache shares them, so
+nothing is pickled per task. Each task reduces one row partition to a
+partial state: per-group count, sum, min and max, plus a log-bucket
+quantile sketch (DDSketch-style, relative error ``RELATIVE_ACCURACY``)
+when quantiles are needed. The parent merges the partial states, which
+are all additive or min/max, and finishes the requested statistic.
+
+Below ``PARALLEL_ROWS`` rows, or on a single core, ``aggregation_engine``
+returns the in-process ``EncodedFrame`` instead.
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.groupby import EncodedFrame, encode
+
+
+PARALLEL_ROWS = 2_000_000
+PARTITION_ROWS = 1_000_000
+
+RELATIVE_ACCURACY = 0.01
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+
+# Sketch keys: sign * (log-bucket + _KEY_OFFSET), 0 for zero; packed with the group code.
+_KEY_OFFSET = 1 << 19
+_KEY_BITS = 22
+
+_pool = None
+_columns = {}
+
+
+# ================= Workers =================
+def _column(path):
+    if path not in _columns:
+        if len(_columns) >= 64:
+            _columns.clear()
+        _columns[path] = np.load(path, mmap_mode="r")
+    return _columns[path]
+
+
+def _sketch_keys(values):
+    keys = np.zeros(len(values), dtype=np.int64)
+    nonzero = values != 0
+    magnitude = np.abs(values[nonzero])
+    buckets = np.ceil(np.log(magnitude) / np.log(_GAMMA)).astype(np.int64)
+    keys[nonzero] = np.sign(values[nonzero]).astype(np.int64) * (np.maximum(buckets, 1 - _KEY_OFFSET) + _KEY_OFFSET)
+    return keys
+
+
+def _sketch_values(keys):
+    values = np.zeros(len(keys))
+    nonzero = keys != 0
+    buckets = np.abs(keys[nonzero]) - _KEY_OFFSET
+    values[nonzero] = np.sign(keys[nonzero]) * 2 * _GAMMA ** buckets / (_GAMMA + 1)
+    return values
+
+
+def _partial(codes_path, values_path, start, stop, k, sketch):
+    """Partial aggregate state of rows ``start:stop``."""
+    codes = np.asarray(_column(codes_path)[start:stop])
+    values = np.asarray(_column(values_path)[start:stop])
+
+    valid = (codes >= 0) & ~np.isnan(values)
+    codes, values = codes[valid].astype(np.intp), values[valid]
+
+    state = {
+        "count": np.bincount(codes, minlength=k),
+        "sum": np.bincount(codes, weights=values, minlength=k),
+        "min": np.full(k, np.inf),
+        "max": np.full(k, -np.inf),
+    }
+    np.minimum.at(state["min"], codes, values)
+    np.maximum.at(state["max"], codes, values)
+
+    if sketch:
+        packed = (codes.astype(np.int64) << _KEY_BITS) | (_sketch_keys(values) + (1 << (_KEY_BITS - 1)))
+        state["sketch"] = np.unique(packed, return_counts=True)
+
+    return state
+
+
+# ================= Merge =================
+def merge(states):
+    """Combine partial states of disjoint partitions."""
+    merged = {
+        "count": np.sum([s["count"] for s in states], axis=0),
+        "sum": np.sum([s["sum"] for s in states], axis=0),
+        "min": np.min([s["min"] for s in states], axis=0),
+        "max": np.max([s["max"] for s in states], axis=0),
+    }
+
+    if "sketch" in states[0]:
+        packed = np.concatenate([s["sketch"][0] for s in states])
+        counts = np.concatenate([s["sketch"][1] for s in states])
+        keys, inverse = np.unique(packed, return_inverse=True)
+        merged["sketch"] = (keys, np.bincount(inverse, weights=counts).astype(np.int64))
+
+    return merged
+
+
+def quantile(state, q, k):
+    """Per-group ``q``-quantile from a merged sketch (relative error ``RELATIVE_ACCURACY``).
+
+    Interpolates linearly between the two nearest ranks, like ``Series.quantile``.
+    """
+    packed, counts = state["sketch"]
+    groups = packed >> _KEY_BITS
+    keys = (packed & ((1 << _KEY_BITS) - 1)) - (1 << (_KEY_BITS - 1))
+
+    cum = np.cumsum(counts)
+    first = np.searchsorted(groups, np.arange(k))
+    before = np.where(first > 0, cum[np.maximum(first - 1, 0)], 0)
+
+    n = state["count"]
+    result = np.full(k, np.nan)
+    present = n > 0
+
+    rank = q * (n[present] - 1)
+    lower = np.floor(rank).astype(np.int64)
+    upper = np.ceil(rank).astype(np.int64)
+
+    low = _sketch_values(keys[np.searchsorted(cum, before[present] + lower + 1)])
+    high = _sketch_values(keys[np.searchsorted(cum, before[present] + upper + 1)])
+    result[present] = low + (rank - lower) * (high - low)
+
+    return result
+
+
+# ================= Engine =================
+def _executor(workers):
+    """The shared pool, recreated when a different worker count is asked for."""
+    global _pool
+    if _pool is not None and _pool._max_workers != workers:
+        _pool.shutdown()
+        _pool = None
+    if _pool is None:
+        # "spawn" keeps workers independent of the (multithreaded) Streamlit server process.
+        _pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+class ParallelFrame:
+    """Drop-in for ``EncodedFrame`` that aggregates row partitions in a process pool.
+
+    Medians come from the mergeable sketch, so they are approximate
+    (within ``RELATIVE_ACCURACY``); sums, counts, means, minima and maxima are exact.
+    """
+
+    approximate_quantiles = True
+
+    def __init__(self, df, cat_cols, num_cols, workers=None, partition_rows=PARTITION_ROWS):
+        self.workers = workers or os.cpu_count() or 1
+        self.n_rows = len(df)
+        self.partition_rows = max(partition_rows, -(-self.n_rows // (4 * self.workers)))
+
+        self._dir = tempfile.mkdtemp(prefix="dashboard-columns-")
+        weakref.finalize(self, shutil.rmtree, self._dir, True)
+
+        self.labels = {}
+        self._paths = {}
+
+        for i, col in enumerate(cat_cols):
+            codes, self.labels[col] = encode(df[col])
+            self._paths[col] = self._save(f"cat{i}", codes)
+
+        for i, col in enumerate(num_cols):
+            self._paths[col] = self._save(f"num{i}", df[col].to_numpy(dtype=float))
+
+    def _save(self, name, array):
+        path = os.path.join(self._dir, f"{name}.npy")
+        np.save(path, array)
+        return path
+
+    def state(self, cat, metric, sketch=False):
+        """Merged partial state of ``metric`` grouped by ``cat``."""
+        k = len(self.labels[cat])
+        bounds = [(s, min(s + self.partition_rows, self.n_rows)) for s in range(0, self.n_rows, self.partition_rows)]
+        args = [(self._paths[cat], self._paths[metric], s, e, k, sketch) for s, e in bounds]
+
+        if self.workers > 1 and len(args) > 1:
+            states = list(_executor(self.workers).map(_partial, *zip(*args)))
+        else:
+            states = [_partial(*a) for a in args]
+
+        return merge(states)
+
+    def aggregate(self, cat, metric, how="sum"):
+        """``metric`` by ``cat`` as a Series like ``df.groupby(cat)[metric].<how>()``.
+
+        ``how`` is ``"sum"``, ``"count"``, ``"mean"``, ``"median"``, ``"min"`` or ``"max"``.
+        """
+        k = len(self.labels[cat])
+        state = self.state(cat, metric, sketch=how == "median")
+        counts = state["count"]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if how == "count":
+                result = counts
+            elif how == "median":
+                result = quantile(state, 0.5, k)
+            elif how in ("min", "max"):
+                result = np.where(counts > 0, state[how], np.nan)
+            elif how == "mean":
+                result = state["sum"] / counts
+            else:
+                result = state["sum"]
+
+        return pd.Series(result, index=pd.Index(self.labels[cat], name=cat), name=metric)
+
+
+def aggregation_engine(df, cat_cols, num_cols):
+    """``ParallelFrame`` for large data on a multi-core host, else ``EncodedFrame``."""
+    if len(df) >= PARALLEL_ROWS and (os.cpu_count() or 1) > 1:
+        return ParallelFrame(df, cat_cols, num_cols)
+    return EncodedFrame(df, cat_cols, num_cols)
@@ -0,0 +1,102 @@
+"""Per-day prefix sums of the Home KPI measures.
+
+Daily totals of every measure are accumulated per country x category
+(plus an "All" slot on each axis) and turned into cumulative sums along
+the day axis. The total over any inclusive date range, for any
+country/category selection, is then ``P[end + 1] - P[start]``: two array
+lookups, which makes the previous-period and previous-year comparisons
+on the Home page free.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.groupby import encode
+
+
+# measure name -> (source column, reduction)
+MEASURES = {
+    "gross": ("Gross_Sales", "sum"),
+    "net": ("Net_Revenue", "sum"),
+    "orders": ("invoicedate", "count"),
+    "returns": ("IsReturned", "sum"),
+    "order_value": ("Total_Order_Value", "sum"),
+    "order_value_n": ("Total_Order_Value", "count"),
+}
+
+
+class PrefixSums:
+    """Cumulative daily KPI measures by country and category."""
+
+    def __init__(self, df):
+        temp = df.dropna(subset=["invoicedate"])
+        days = temp["invoicedate"].dt.normalize()
+
+        self.first_day = days.min()
+        self.n_days = int((days.max() - self.first_day).days) + 1
+        day = (days - self.first_day).dt.days.to_numpy()
+
+        country, self.countries = encode(temp["country"])
+        category, self.categories = encode(temp["category"])
+        self._country = {v: i for i, v in enumerate(self.countries)}
+        self._category = {v: i for i, v in enumerate(self.categories)}
+
+        n_country, n_category = len(self.countries), len(self.categories)
+        valid = (country >= 0) & (category >= 0)
+        cell = np.ravel_multi_index(
+            (country[valid], category[valid], day[valid]), (n_country, n_category, self.n_days)
+        )
+
+        # Axis layout: [measure, country (+All), category (+All), day (+leading zero)]
+        self.prefix = np.zeros((len(MEASURES), n_country + 1, n_category + 1, self.n_days + 1))
+
+        for m, (col, how) in enumerate(MEASURES.values()):
+            values = temp[col].to_numpy()[valid]
+            if how == "count":
+                weights = pd.notna(values).astype(float)
+            else:
+                weights = np.nan_to_num(values.astype(float))
+
+            daily = np.bincount(cell, weights=weights, minlength=n_country * n_category * self.n_days)
+            daily = daily.reshape(n_country, n_category, self.n_days)
+
+            block = self.prefix[m]
+            block[:n_country, :n_category, 1:] = daily
+            block[n_country, :n_category, 1:] = daily.sum(axis=0)
+            block[:, n_category, 1:] = block[:, :n_category, 1:].sum(axis=1)
+
+        np.cumsum(self.prefix, axis=3, out=self.prefix)
+
+    def _day(self, date):
+        return (pd.Timestamp(date).normalize() - self.first_day).days
+
+    def totals(self, start, end, country="All", category="All"):
+        """Sum of every measure over the inclusive day range ``start``..``end``."""
+        i = len(self.countries) if country == "All" else self._country.get(country)
+        j = len(self.categories) if category == "All" else self._category.get(category)
+
+        lo = min(max(self._day(start), 0), self.n_days)
+        hi = min(max(self._day(end) + 1, 0), self.n_days)
+
+        if i is None or j is None or hi <= lo:
+            return dict.fromkeys(MEASURES, 0.0)
+
+        sums = self.prefix[:, i, j, hi] - self.prefix[:, i, j, lo]
+        return dict(zip(MEASURES, sums))
+
+    def kpis(self, start, end, country="All", category="All"):
+        """The Home page KPIs over an inclusive date range."""
+        return kpis_from_totals(self.totals(start, end, country, category))
+
+
+def kpis_from_totals(t):
+    """The Home page KPIs from ``MEASURES`` totals."""
+    orders = int(round(t["orders"]))
+
+    return {
+        "total_sales": t["gross"],
+        "net_revenue": t["net"],
+        "total_orders": orders,
+        "return_rate": t["returns"] / orders * 100 if orders else float("nan"),
+        "avg_order": t["order_value"] / t["order_value_n"] if t["order_value_n"] else float("nan"),
+    }
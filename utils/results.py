@@ -0,0 +1,50 @@
+"""Process-wide cache of Home page results per filter state.
+
+Many sessions look at the same few views (all countries, the top
+categories, last month). The KPIs, preview rows and summary of a view are
+cached across sessions under (dataset, version, date range, country,
+category), so a popular view is served without touching the data.
+"""
+
+import os
+
+import pandas as pd
+
+from utils.lru import LRUCache
+
+
+# Largest "Number of Rows" the Home preview offers.
+PREVIEW_ROWS = 50
+
+HOME_CACHE = LRUCache(
+    max_bytes=int(os.environ.get("DASHBOARD_RESULTS_MB", "64")) * 2**20,
+    max_items=1024
+)
+
+
+def home_view(df, prefix, start, end, country="All", category="All"):
+    """KPIs, preview rows and summary of one Home filter state (inclusive dates)."""
+    mask = (df["invoicedate"] >= start) & (df["invoicedate"] < end + pd.Timedelta(days=1))
+
+    if country != "All":
+        mask &= df["country"] == country
+
+    if category != "All":
+        mask &= df["category"] == category
+
+    filtered = df[mask]
+
+    return {
+        "kpis": prefix.kpis(start, end, country, category),
+        # A copy: a head() view would keep every filtered row alive in the cache.
+        "preview": filtered.head(PREVIEW_ROWS).copy(),
+        "rows": filtered.shape[0],
+        "cols": filtered.shape[1],
+        "missing": int(filtered.isnull().sum().sum()),
+    }
+
+
+def cached_home_view(dataset, version, df, prefix, start, end, country="All", category="All"):
+    """``home_view`` from the shared cache, computed on a miss."""
+    key = (dataset, version, start, end, country, category)
+    return HOME_CACHE.get_or_build(key, lambda: home_view(df, prefix, start, end, country, category))
@@ -0,0 +1,82 @@
+"""Deterministic stratified samples for the scatter views.
+
+Every row gets a 64-bit hash of its contents. Within each stratum (a
+combination of ``STRATA`` values) the rows with the smallest hashes are
+kept (bottom-k, a reservoir that needs no random state), up to the
+largest sample size. A sample of size ``n`` takes each stratum's lowest
+hashes in proportion to the stratum's share of the rows. The result
+depends only on the data, so the same data always gives the same sample.
+Appended rows are folded in by merging their hashes into the per-stratum
+reservoirs, without rescanning earlier rows.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+STRATA = ["category", "country", "IsReturned"]
+
+SAMPLE_SIZES = (500, 1000, 2000, 5000)
+
+
+class StratifiedSample:
+    """Per-stratum bottom-k reservoirs and the row ids of each fixed-size sample."""
+
+    def __init__(self, df, strata=STRATA, sizes=SAMPLE_SIZES):
+        self.strata = [c for c in strata if c in df.columns]
+        self.sizes = tuple(sizes)
+        self.n_rows = 0
+
+        self._reservoirs = {}
+        self._counts = {}
+        self._samples = {}
+
+        self.update(df)
+
+    def update(self, df):
+        """Fold appended rows in; their row ids continue after the rows seen so far."""
+        hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        ids = np.arange(self.n_rows, self.n_rows + len(df))
+        cap = max(self.sizes)
+
+        if self.strata:
+            groups = df.groupby(self.strata, observed=True, dropna=False, sort=False).indices
+        else:
+            groups = {(): np.arange(len(df))}
+
+        empty = (np.empty(0, dtype=hashes.dtype), np.empty(0, dtype=ids.dtype))
+
+        for key, positions in groups.items():
+            old_hashes, old_ids = self._reservoirs.get(key, empty)
+            h = np.concatenate([old_hashes, hashes[positions]])
+            r = np.concatenate([old_ids, ids[positions]])
+
+            if len(h) > cap:
+                keep = np.argpartition(h, cap - 1)[:cap]
+                h, r = h[keep], r[keep]
+
+            order = np.lexsort((r, h))
+            self._reservoirs[key] = (h[order], r[order])
+            self._counts[key] = self._counts.get(key, 0) + len(positions)
+
+        self.n_rows += len(df)
+        self._samples = {size: self._draw(size) for size in self.sizes}
+
+        return self
+
+    def _draw(self, n):
+        keys = sorted(self._reservoirs, key=str)
+        counts = np.array([self._counts[k] for k in keys], dtype=float)
+
+        # Proportional allocation, rounded by largest remainder.
+        quota = min(n, self.n_rows) * counts / counts.sum()
+        take = np.floor(quota).astype(int)
+        extra = int(round(quota.sum())) - take.sum()
+        take[np.argsort(-(quota - take), kind="stable")[:extra]] += 1
+
+        ids = [self._reservoirs[k][1][:t] for k, t in zip(keys, take)]
+        return np.sort(np.concatenate(ids)) if ids else np.empty(0, dtype=int)
+
+    def sample(self, size):
+        """Sorted row positions of the sample of ``size`` (one of ``sizes``)."""
+        return self._samples[size]
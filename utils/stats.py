@@ -0,0 +1,55 @@
+"""Vectorised statistics over the full dataset."""
+
+import numpy as np
+import pandas as pd
+
+
+def correlation_matrix(df, cols):
+    """Pearson correlation of every pair in ``cols`` over the full data, in one pass.
+
+    Matches ``df[cols].corr()``: each pair uses the rows where both values are
+    present. Columns are centred first so the moment sums stay well conditioned;
+    all pair counts and sums then come out of a few matrix products.
+    """
+    x = df[cols].to_numpy(dtype=float)
+    x = x - np.nanmean(x, axis=0)
+
+    present = ~np.isnan(x)
+
+    if present.all():
+        with np.errstate(invalid="ignore", divide="ignore"):
+            r = np.corrcoef(x, rowvar=False)
+    else:
+        m = present.astype(float)
+        x0 = np.where(present, x, 0.0)
+
+        n = m.T @ m                  # rows with both values
+        sx = x0.T @ m                # sum of x_i over those rows
+        sxx = (x0 * x0).T @ m        # sum of x_i^2 over those rows
+        sxy = x0.T @ x0              # sum of x_i * x_j
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = n * sxy - sx * sx.T
+            var = n * sxx - sx * sx
+            r = cov / np.sqrt(var * var.T)
+            r[n < 2] = np.nan
+
+    r = np.clip(r, -1.0, 1.0)
+    diag = np.diag_indices_from(r)
+    r[diag] = np.where(np.isnan(r[diag]), np.nan, 1.0)
+
+    return pd.DataFrame(r, index=cols, columns=cols)
+
+
+def ranked_pairs(matrix):
+    """Every distinct column pair with its correlation, strongest first."""
+    cols = matrix.columns
+    i, j = np.triu_indices(len(cols), k=1)
+
+    pairs = pd.DataFrame({
+        "Variable 1": cols[i],
+        "Variable 2": cols[j],
+        "Correlation": matrix.to_numpy()[i, j],
+    })
+
+    return pairs.reindex(pairs["Correlation"].abs().sort_values(ascending=False).index).reset_index(drop=True)
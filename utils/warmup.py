@@ -0,0 +1,169 @@
+"""Precomputed page artifacts for the current dataset version.
+
+``build()`` loads every frame the pages use, runs the Insights aggregates,
+the data-quality statistics and the profiling report, and publishes them
+under ``WARM_DIR`` in one atomic pointer switch. Pages call
+``load_artifact`` / ``load_profile_html`` and fall back to computing the
+value themselves when no snapshot matches the files on disk.
+"""
+
+import json
+import os
+import shutil
+import time
+
+import pandas as pd
+
+from utils.bootstrap import insight_uncertainty
+from utils.charts import insight_aggregates, insight_crossfilter, insight_scatter_rows, insight_statistics
+from utils.customers import CustomerTable
+from utils.heavy_hitters import HeavyHitters
+from utils.prefix import PrefixSums
+from utils.sampling import StratifiedSample
+from utils.data import (
+    COMPACT, DATA_PATH, RAW_DATA_PATH, dataset_version, high_cardinality_columns, memory_report, numeric_columns,
+    read_bivariate, read_dataset, read_home, read_insights, raw_statistics
+)
+from utils.stats import correlation_matrix
+
+
+WARM_DIR = ".warm_cache"
+POINTER = "CURRENT"
+
+
+# ================= Versions =================
+def current_version(use_hash=False, data_path=DATA_PATH, raw_path=RAW_DATA_PATH):
+    """Version of the dashboard inputs: the cleaned and the raw dataset together."""
+    mode = "compact" if COMPACT else "full"
+    return f"{dataset_version(data_path, use_hash)}_{dataset_version(raw_path, use_hash)}_{mode}"
+
+
+def read_pointer(root=WARM_DIR):
+    try:
+        with open(os.path.join(root, POINTER), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_pointer(pointer, root=WARM_DIR):
+    """Switch readers to ``pointer`` atomically (write aside, then ``os.replace``)."""
+    tmp = os.path.join(root, f"{POINTER}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(pointer, f)
+    os.replace(tmp, os.path.join(root, POINTER))
+
+
+def _snapshot_dir(root=WARM_DIR):
+    pointer = read_pointer(root)
+    if pointer is None or pointer["version"] != current_version():
+        return None
+    return os.path.join(root, pointer["dir"])
+
+
+# ================= Readers =================
+def load_artifact(name, builder, root=WARM_DIR):
+    """Return the warm artifact ``name`` if it matches the data on disk, else ``builder()``."""
+    snapshot = _snapshot_dir(root)
+    if snapshot is not None:
+        path = os.path.join(snapshot, f"{name}.pkl")
+        if os.path.exists(path):
+            return pd.read_pickle(path)
+    return builder()
+
+
+def load_profile_html(root=WARM_DIR):
+    """Warm profiling report HTML, or ``None`` when it has not been precomputed."""
+    snapshot = _snapshot_dir(root)
+    if snapshot is None:
+        return None
+    try:
+        with open(os.path.join(snapshot, "profile.html"), encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+# ================= Builder =================
+def build(root=WARM_DIR, profile=True, use_hash=False):
+    """Compute every artifact for the current data and publish it; returns the pointer."""
+    version = current_version()
+    content = current_version(use_hash=True) if use_hash else version
+    os.makedirs(root, exist_ok=True)
+
+    # Same content under a new mtime (e.g. a re-copy): reuse the published snapshot.
+    pointer = read_pointer(root)
+    if use_hash and pointer is not None and pointer.get("content") == content:
+        pointer = dict(pointer, version=version)
+        write_pointer(pointer, root)
+        return pointer
+
+    name = f"{content}-{int(time.time())}"
+    tmp = os.path.join(root, f"{name}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    start = time.perf_counter()
+
+    if os.path.exists(DATA_PATH):
+        home = read_home()
+        pd.to_pickle(home, os.path.join(tmp, "home.pkl"))
+        pd.to_pickle(CustomerTable.from_transactions(home), os.path.join(tmp, "customers.pkl"))
+        pd.to_pickle(PrefixSums(home), os.path.join(tmp, "prefix.pkl"))
+        pd.to_pickle(read_dataset(), os.path.join(tmp, "univariate.pkl"))
+        bivariate = read_bivariate()
+        pd.to_pickle(bivariate, os.path.join(tmp, "bivariate.pkl"))
+        pd.to_pickle(correlation_matrix(bivariate, numeric_columns(bivariate)), os.path.join(tmp, "correlations.pkl"))
+        pd.to_pickle(StratifiedSample(bivariate), os.path.join(tmp, "samples.pkl"))
+        pd.to_pickle(HeavyHitters.from_frame(bivariate, high_cardinality_columns(bivariate)), os.path.join(tmp, "heavy_hitters.pkl"))
+
+        insights = read_insights()
+        aggregates = insight_aggregates(insights)
+        pd.to_pickle(insights, os.path.join(tmp, "insights.pkl"))
+        pd.to_pickle(aggregates, os.path.join(tmp, "insight_aggregates.pkl"))
+        pd.to_pickle(insight_statistics(insights, aggregates), os.path.join(tmp, "insight_statistics.pkl"))
+        pd.to_pickle(insight_crossfilter(insights), os.path.join(tmp, "crossfilter.pkl"))
+        scatter_rows = insight_scatter_rows(insights)
+        pd.to_pickle(scatter_rows, os.path.join(tmp, "insight_scatter_rows.pkl"))
+        pd.to_pickle(insights.iloc[scatter_rows], os.path.join(tmp, "insight_scatter_sample.pkl"))
+        pd.to_pickle(insight_uncertainty(insights), os.path.join(tmp, "insight_uncertainty.pkl"))
+        pd.to_pickle(memory_report(read_insights(compact=False)), os.path.join(tmp, "memory_report.pkl"))
+
+    if os.path.exists(RAW_DATA_PATH):
+        raw = pd.read_csv(RAW_DATA_PATH)
+        pd.to_pickle(raw_statistics(raw), os.path.join(tmp, "raw_statistics.pkl"))
+
+        if profile:
+            from ydata_profiling import ProfileReport
+
+            with open(os.path.join(tmp, "profile.html"), "w", encoding="utf-8") as f:
+                f.write(ProfileReport(raw, explorative=True).to_html())
+
+    os.rename(tmp, os.path.join(root, name))
+
+    pointer = {
+        "version": version,
+        "content": content,
+        "dir": name,
+        "built_at": time.time(),
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+    write_pointer(pointer, root)
+
+    return pointer
+
+
+def prune(root=WARM_DIR, keep=2):
+    """Delete all but the newest ``keep`` snapshots, never the published one."""
+    pointer = read_pointer(root)
+    current = pointer["dir"] if pointer else None
+
+    dirs = sorted(
+        (d for d in os.listdir(root) if os.path.isdir(os.path.join(root, d)) and not d.endswith(".tmp")),
+        key=lambda d: os.path.getmtime(os.path.join(root, d)),
+        reverse=True
+    )
+
+    for d in dirs[keep:]:
+        if d != current:
+            shutil.rmtree(os.path.join(root, d), ignore_errors=True)